@@ -1,32 +1,69 @@
 import os
-import json
-from datetime import date, datetime
+from datetime import date, timedelta
 from urllib.parse import urljoin
 import io
+import logging
+import re
+import sys
 import base64
+import hashlib
+import heapq
+import hmac
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import defaultdict, namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache, wraps
+from operator import itemgetter
+from types import MappingProxyType
 
 from dotenv import load_dotenv
-from flask import Flask, render_template, request, redirect, url_for, flash, make_response, jsonify
+from flask import Flask, render_template, request, redirect, url_for, flash, make_response, jsonify, session, send_file, g
+from flask.json.provider import DefaultJSONProvider
 from flask_login import LoginManager, UserMixin, login_user, logout_user, login_required, current_user
-from werkzeug.security import generate_password_hash, check_password_hash
+from itsdangerous import BadSignature, SignatureExpired, URLSafeTimedSerializer
+from jinja2 import FileSystemBytecodeCache
+from werkzeug.security import check_password_hash
+import orjson
 import requests
-import qrcode
+from requests.adapters import HTTPAdapter
+import urllib3
+from urllib3.util.retry import Retry
+from urllib3.util.request import ACCEPT_ENCODING
+import segno
 
 # Load .env
 load_dotenv()
 
+# Same logger as app.logger; debug output only appears when running with FLASK_DEBUG=1
+logger = logging.getLogger(__name__)
+
 # Get BASE_URL from environment and normalize it
 BASE_URL = os.getenv("BASE_URL", "https://oracleapex.com/ords/ifs325_techinnovators").rstrip("/")
-# Remove any existing module suffix to ensure clean ORDS base
-if "/inventory_booking" in BASE_URL:
-    BASE_URL = BASE_URL.replace("/inventory_booking", "")
-if "/employees" in BASE_URL:
-    BASE_URL = BASE_URL.replace("/employees", "")
-if "/inventory" in BASE_URL:
-    BASE_URL = BASE_URL.replace("/inventory", "")
+# Remove any existing module suffix to ensure clean ORDS base; only whole path segments
+# match, so e.g. /inventory_items is left alone
+BASE_URL = re.sub(r"/(?:inventory_booking|employees|inventory)(?=$|/)", "", BASE_URL)
 
 MOCK = os.getenv("MOCK", "0") == "1"  # Use live APEX data by default
 FLASK_DEBUG = os.getenv("FLASK_DEBUG", "0") == "1"
+APEX_CACHE_TTL = int(os.getenv("APEX_CACHE_TTL", "60"))  # seconds; 0 disables the GET cache, bookings included
+# seconds; bookings change often, so keep this short
+BOOKINGS_CACHE_TTL = int(os.getenv("BOOKINGS_CACHE_TTL", "5")) if APEX_CACHE_TTL > 0 else 0
+# Set once the APEX app exposes inventory_booking/return_and_restock (return + quantity bump in one transaction)
+APEX_RETURN_AND_RESTOCK = os.getenv("APEX_RETURN_AND_RESTOCK", "0") == "1"
+APEX_CACHE_WARMUP = os.getenv("APEX_CACHE_WARMUP", "0") == "1"  # opt-in: keep the roster and inventory GETs cached while the dev server runs
+USE_VERIFY_PASSWORD_CACHE = os.getenv("USE_VERIFY_PASSWORD_CACHE", "0") == "1"  # memoize successful password checks
+
+EMPLOYEE_BOOKINGS_PAGE_SIZE = 25  # rows per page of an employee's booking history
+
+# Sentinel APEX uses for t_return_date on bookings that are still out
+NOT_RETURNED = sys.intern("Not Returned")
+# Strict YYYY-MM-DD; date.fromisoformat alone also accepts compact and week-date forms
+_ISO_DATE = re.compile(r"\d{4}-\d{2}-\d{2}")
+# Error-message classifiers for APEX failures; timeouts take precedence over connection errors
+_APEX_TIMEOUT_ERROR = re.compile(r"timeout|took too long", re.I)
+_APEX_CONNECTION_ERROR = re.compile(r"unable to reach|connection", re.I)
 
 # Global variable to track mock inventory changes (only used when MOCK=True)
 mock_inventory_changes = {}
@@ -42,8 +79,43 @@ if MOCK:
 else:
     print(f"INFO: Running in LIVE mode - connecting to Oracle APEX at: {BASE_URL}")
 
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson; types orjson can't encode go through Flask's default hook."""
+    
+    def _option(self, sort_keys, indent):
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+    
+    def dumps(self, obj, **kwargs):
+        option = self._option(kwargs.pop("sort_keys", self.sort_keys), kwargs.pop("indent", None))
+        kwargs.pop("separators", None)  # orjson output is always compact
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+    
+    def response(self, *args, **kwargs):
+        """jsonify(): hand orjson's bytes straight to the response instead of decoding to str and re-encoding."""
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        option = self._option(self.sort_keys, indent) | orjson.OPT_APPEND_NEWLINE
+        return self._app.response_class(orjson.dumps(obj, default=self.default, option=option), mimetype=self.mimetype)
+    
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
+# Share compiled template bytecode across worker processes and restarts; Flask already keeps parsed templates in memory
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache()
 app.secret_key = os.getenv("FLASK_SECRET", "dev-secret-key-change-in-production")  # for flash messages and sessions
+if FLASK_DEBUG:
+    app.logger.setLevel(logging.DEBUG)  # app.logger is `logger`; this also attaches Flask's default handler
 
 # Initialize Flask-Login
 login_manager = LoginManager()
@@ -52,11 +124,15 @@ login_manager.login_view = 'login'
 login_manager.login_message = 'Please log in to access this page.'
 login_manager.login_message_category = 'info'
 
+# Booking QR images are linked through short-lived signed URLs so they can be served without a login session
+SIGNED_QR_MAX_AGE = 300  # seconds a signed QR link stays valid
+_QR_URL_SIGNER = URLSafeTimedSerializer(app.secret_key, salt="booking-qrcode")
+
 # Enhanced User class for Flask-Login with role support
 class User(UserMixin):
     def __init__(self, id, role="employee", employee_id=None):
         self.id = id
-        self.role = role
+        self.role = sys.intern(role)  # interned so role checks against the literals compare by identity first
         self.employee_id = employee_id
     
     def is_admin(self):
@@ -68,133 +144,278 @@ class User(UserMixin):
     def get_employee_id(self):
         return self.employee_id
 
+# Pre-computed password hashes so importing the app does not run the KDF.
+# Regenerate with werkzeug.security.generate_password_hash if the demo passwords change.
+ADMIN_PASSWORD_HASH = "pbkdf2:sha256:1000000$TQBtx0sZrM7HUZwu$fcd7c5a727f51bd3e680e7b7ccc7184eafa24018a6de385de31a08c444fcb321"  # password123
+EMPLOYEE_PASSWORD_HASH = "pbkdf2:sha256:1000000$1YSAlgBC9VM10gpt$cfdec510f65299c37135f3c5a59f16deeaa676d6ae04dd2a8a0555e1bf01f98e"  # employee123
+# Hash of a random throwaway password, checked for unknown usernames so they cost the same as wrong passwords
+DUMMY_PASSWORD_HASH = "pbkdf2:sha256:1000000$ND7QYVEBF03p0nQ3$52d4e510bec8dcadfc324918b95aece31e3b97e26aa5657332ab625a8aea9986"
+
 # User credentials with roles (in production, use a proper database)
 USERS = {
-    "admin": {"password": generate_password_hash("password123"), "role": "admin", "employee_id": None},
+    "admin": {"password": ADMIN_PASSWORD_HASH, "role": "admin", "employee_id": None},
     # Employee accounts based on actual APEX data
-    "Candice": {"password": generate_password_hash("employee123"), "role": "employee", "employee_id": 114},
-    "Peter": {"password": generate_password_hash("employee123"), "role": "employee", "employee_id": 116},
-    "Jessica": {"password": generate_password_hash("employee123"), "role": "employee", "employee_id": 109},
-    "Ayakha": {"password": generate_password_hash("employee123"), "role": "employee", "employee_id": 61},
-    "Nomsa": {"password": generate_password_hash("employee123"), "role": "employee", "employee_id": 105},
-    "Sipho": {"password": generate_password_hash("employee123"), "role": "employee", "employee_id": 3},
-    "Sarah": {"password": generate_password_hash("employee123"), "role": "employee", "employee_id": 101},
-    "Neo": {"password": generate_password_hash("employee123"), "role": "employee", "employee_id": 115},
-    "Khanyi": {"password": generate_password_hash("employee123"), "role": "employee", "employee_id": 111},
-    "Thabo": {"password": generate_password_hash("employee123"), "role": "employee", "employee_id": 1},
-    "David": {"password": generate_password_hash("employee123"), "role": "employee", "employee_id": 102},
-    "Rebecca": {"password": generate_password_hash("employee123"), "role": "employee", "employee_id": 120},
-    "Lerato": {"password": generate_password_hash("employee123"), "role": "employee", "employee_id": 4},
-    "Linda": {"password": generate_password_hash("employee123"), "role": "employee", "employee_id": 117},
-    "Sangesonke": {"password": generate_password_hash("employee123"), "role": "employee", "employee_id": 21},
-    "Zama": {"password": generate_password_hash("employee123"), "role": "employee", "employee_id": 41},
-    "Aisha": {"password": generate_password_hash("employee123"), "role": "employee", "employee_id": 2},
-    "Michael": {"password": generate_password_hash("employee123"), "role": "employee", "employee_id": 110},
-    "Emily": {"password": generate_password_hash("employee123"), "role": "employee", "employee_id": 107},
-    "Ashley": {"password": generate_password_hash("employee123"), "role": "employee", "employee_id": 118},
-    "Daniel": {"password": generate_password_hash("employee123"), "role": "employee", "employee_id": 112},
-    "John": {"password": generate_password_hash("employee123"), "role": "employee", "employee_id": 104}
+    "Candice": {"password": EMPLOYEE_PASSWORD_HASH, "role": "employee", "employee_id": 114},
+    "Peter": {"password": EMPLOYEE_PASSWORD_HASH, "role": "employee", "employee_id": 116},
+    "Jessica": {"password": EMPLOYEE_PASSWORD_HASH, "role": "employee", "employee_id": 109},
+    "Ayakha": {"password": EMPLOYEE_PASSWORD_HASH, "role": "employee", "employee_id": 61},
+    "Nomsa": {"password": EMPLOYEE_PASSWORD_HASH, "role": "employee", "employee_id": 105},
+    "Sipho": {"password": EMPLOYEE_PASSWORD_HASH, "role": "employee", "employee_id": 3},
+    "Sarah": {"password": EMPLOYEE_PASSWORD_HASH, "role": "employee", "employee_id": 101},
+    "Neo": {"password": EMPLOYEE_PASSWORD_HASH, "role": "employee", "employee_id": 115},
+    "Khanyi": {"password": EMPLOYEE_PASSWORD_HASH, "role": "employee", "employee_id": 111},
+    "Thabo": {"password": EMPLOYEE_PASSWORD_HASH, "role": "employee", "employee_id": 1},
+    "David": {"password": EMPLOYEE_PASSWORD_HASH, "role": "employee", "employee_id": 102},
+    "Rebecca": {"password": EMPLOYEE_PASSWORD_HASH, "role": "employee", "employee_id": 120},
+    "Lerato": {"password": EMPLOYEE_PASSWORD_HASH, "role": "employee", "employee_id": 4},
+    "Linda": {"password": EMPLOYEE_PASSWORD_HASH, "role": "employee", "employee_id": 117},
+    "Sangesonke": {"password": EMPLOYEE_PASSWORD_HASH, "role": "employee", "employee_id": 21},
+    "Zama": {"password": EMPLOYEE_PASSWORD_HASH, "role": "employee", "employee_id": 41},
+    "Aisha": {"password": EMPLOYEE_PASSWORD_HASH, "role": "employee", "employee_id": 2},
+    "Michael": {"password": EMPLOYEE_PASSWORD_HASH, "role": "employee", "employee_id": 110},
+    "Emily": {"password": EMPLOYEE_PASSWORD_HASH, "role": "employee", "employee_id": 107},
+    "Ashley": {"password": EMPLOYEE_PASSWORD_HASH, "role": "employee", "employee_id": 118},
+    "Daniel": {"password": EMPLOYEE_PASSWORD_HASH, "role": "employee", "employee_id": 112},
+    "John": {"password": EMPLOYEE_PASSWORD_HASH, "role": "employee", "employee_id": 104}
 }
 
-# Employee ID to username mapping for QR login
+# Employee ID to username mapping for QR login, derived from USERS so the two cannot drift.
+# Keyed by the integer id; qr_login normalises the QR payload's empid to an int before the lookup.
 EMPLOYEE_USERS = {
-    "114": "Candice",  # Employee ID 114 maps to Candice user
-    "116": "Peter",    # Employee ID 116 maps to Peter user
-    "109": "Jessica",  # Employee ID 109 maps to Jessica user
-    "61": "Ayakha",    # Employee ID 61 maps to Ayakha user
-    "105": "Nomsa",    # Employee ID 105 maps to Nomsa user
-    "3": "Sipho",      # Employee ID 3 maps to Sipho user
-    "101": "Sarah",    # Employee ID 101 maps to Sarah user
-    "115": "Neo",      # Employee ID 115 maps to Neo user
-    "111": "Khanyi",   # Employee ID 111 maps to Khanyi user
-    "1": "Thabo",      # Employee ID 1 maps to Thabo user
-    "102": "David",    # Employee ID 102 maps to David user
-    "120": "Rebecca",  # Employee ID 120 maps to Rebecca user
-    "4": "Lerato",     # Employee ID 4 maps to Lerato user
-    "117": "Linda",    # Employee ID 117 maps to Linda user
-    "21": "Sangesonke", # Employee ID 21 maps to Sangesonke user
-    "41": "Zama",      # Employee ID 41 maps to Zama user
-    "2": "Aisha",      # Employee ID 2 maps to Aisha user
-    "110": "Michael",  # Employee ID 110 maps to Michael user
-    "107": "Emily",    # Employee ID 107 maps to Emily user
-    "118": "Ashley",   # Employee ID 118 maps to Ashley user
-    "112": "Daniel",   # Employee ID 112 maps to Daniel user
-    "104": "John"      # Employee ID 104 maps to John user
+    data["employee_id"]: username
+    for username, data in USERS.items() if data["employee_id"] is not None
 }
 
+# Successful password checks, keyed by (stored hash, HMAC of the attempt) so plaintext is never kept
+_VERIFY_CACHE_SIZE = 256
+_verified_passwords = {}
+_verified_passwords_lock = threading.Lock()
+
+def verify_password(stored_hash, password):
+    """Check a password against its stored hash, skipping the KDF for repeat logins when the cache is enabled."""
+    if not USE_VERIFY_PASSWORD_CACHE:
+        return check_password_hash(stored_hash, password)
+    digest = hmac.new(app.secret_key.encode(), password.encode(), hashlib.sha256).digest()
+    key = (stored_hash, digest)
+    if key in _verified_passwords:
+        return True
+    if not check_password_hash(stored_hash, password):
+        return False
+    with _verified_passwords_lock:
+        if len(_verified_passwords) >= _VERIFY_CACHE_SIZE:
+            _verified_passwords.pop(next(iter(_verified_passwords)))
+        _verified_passwords[key] = True
+    return True
+
+# One shared User per account; User holds no per-request state, so the loader can hand out the same instance
+_USER_CACHE = {username: User(username, data["role"], data["employee_id"]) for username, data in USERS.items()}
+
 @login_manager.user_loader
 def load_user(user_id):
-    if user_id in USERS:
-        user_data = USERS[user_id]
-        return User(user_id, user_data["role"], user_data["employee_id"])
-    return None
+    return _USER_CACHE.get(user_id)
 
 # ---- Authorization Decorators ----
-def admin_required(f):
-    """Decorator to require admin role."""
-    from functools import wraps
-    @wraps(f)
-    def decorated_function(*args, **kwargs):
-        if not current_user.is_authenticated:
-            flash("Please log in to access this page.", "danger")
-            return redirect(url_for('login'))
-        if not current_user.is_admin():
-            flash("Access denied. Admin privileges required.", "danger")
-            return redirect(url_for('employee_dashboard'))
-        return f(*args, **kwargs)
-    return decorated_function
-
-def employee_required(f):
-    """Decorator to require employee role."""
-    from functools import wraps
-    @wraps(f)
-    def decorated_function(*args, **kwargs):
-        if not current_user.is_authenticated:
-            flash("Please log in to access this page.", "danger")
-            return redirect(url_for('login'))
-        if not current_user.is_employee():
-            flash("Access denied. Employee privileges required.", "danger")
-            return redirect(url_for('index'))
-        return f(*args, **kwargs)
-    return decorated_function
+def _role_required(role, fallback_view, denied_message):
+    """Build a decorator that only lets users with `role` through, redirecting everyone else."""
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if not current_user.is_authenticated:
+                flash("Please log in to access this page.", "danger")
+                return redirect(url_for('login'))
+            if current_user.role != role:
+                flash(denied_message, "danger")
+                return redirect(url_for(fallback_view))
+            return f(*args, **kwargs)
+        return decorated_function
+    return decorator
+
+# Decorator to require admin role.
+admin_required = _role_required("admin", "employee_dashboard", "Access denied. Admin privileges required.")
+# Decorator to require employee role.
+employee_required = _role_required("employee", "index", "Access denied. Employee privileges required.")
 
 def verify_ownership(employee_id):
     """Verify that the current user owns the resource."""
     if not current_user.is_authenticated:
         return False
-    if current_user.is_admin():
+    if current_user.role == "admin":
         return True  # Admins can access everything
-    return current_user.get_employee_id() == employee_id
+    return current_user.employee_id == employee_id
 
 # ---- Helper functions ----
-def _get(endpoint, params=None):
-    """GET JSON from ORDS endpoint. endpoint is like 'employees/get'."""
+# Shared ORDS session so connections (TCP + TLS) are reused across APEX calls; the diagnostic routes bypass it
+_APEX_HEADERS = MappingProxyType({
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+    "Accept": "application/json",
+    "Accept-Language": "en-US,en;q=0.9",
+    # Only the encodings this urllib3 can decode (br/zstd are added when brotli/zstandard are installed)
+    "Accept-Encoding": ACCEPT_ENCODING,
+    "Connection": "keep-alive"
+})
+_APEX_TIMEOUT = (5, 30)  # (connect, read) seconds: fail fast on an unreachable host, allow slow queries
+_APEX_SESSION = requests.Session()
+_APEX_SESSION.headers.update(_APEX_HEADERS)
+# Sized for the request threads plus _APEX_EXECUTOR's workers, so no caller has to open a throwaway connection
+_APEX_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=32,
+    max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504], raise_on_status=False)
+))
+
+# In-process cache for read-mostly ORDS GETs: {(endpoint, params): (expires_at, response)}
+# Maps each cached endpoint to its TTL; writes through _post/_put drop the resource's entries
+_CACHED_ENDPOINTS = {
+    "employees/get": APEX_CACHE_TTL,
+    "inventory/get": APEX_CACHE_TTL,
+    "inventory_booking/get_date_data": BOOKINGS_CACHE_TTL,
+}
+_apex_cache = {}
+_apex_cache_lock = threading.Lock()
+# Invalidation counts per resource prefix ('inventory/'); '' counts full clears
+_apex_cache_generation = {}
+
+def _cache_key(endpoint, params):
+    return (endpoint, tuple(sorted((params or {}).items())))
+
+def _cache_prefix(endpoint):
+    return endpoint.split("/", 1)[0] + "/"
+
+def _cache_generation(endpoint):
+    """Snapshot of the invalidations that affect endpoint; taken before a fetch and checked when storing it."""
+    prefix = _cache_prefix(endpoint)
+    with _apex_cache_lock:
+        return (_apex_cache_generation.get("", 0), _apex_cache_generation.get(prefix, 0))
+
+def _cache_lookup(key):
+    with _apex_cache_lock:
+        entry = _apex_cache.get(key)
+    if entry and entry[0] > time.monotonic():
+        return entry[1]
+    return None
+
+def _cache_store(key, value, ttl, generation):
+    """Cache value unless its resource was invalidated since generation was taken (the data may predate a write)."""
+    prefix = _cache_prefix(key[0])
+    with _apex_cache_lock:
+        if generation != (_apex_cache_generation.get("", 0), _apex_cache_generation.get(prefix, 0)):
+            return
+        _apex_cache[key] = (time.monotonic() + ttl, value)
+
+def _invalidate_cache(endpoint):
+    """Drop cached GETs for the resource a write endpoint touches ('inventory/update' -> 'inventory/...')."""
+    prefix = _cache_prefix(endpoint)
+    with _apex_cache_lock:
+        _apex_cache_generation[prefix] = _apex_cache_generation.get(prefix, 0) + 1
+        for key in [k for k in _apex_cache if k[0].startswith(prefix)]:
+            del _apex_cache[key]
+
+def _clear_cache():
+    """Drop every cached GET, e.g. after the data was changed directly in APEX."""
+    with _apex_cache_lock:
+        _apex_cache_generation[""] = _apex_cache_generation.get("", 0) + 1
+        _apex_cache.clear()
+
+def _apex_error_kind(error_msg):
+    """Classify an APEX error message as 'timeout', 'connection' or None."""
+    if _APEX_TIMEOUT_ERROR.search(error_msg):
+        return "timeout"
+    if _APEX_CONNECTION_ERROR.search(error_msg):
+        return "connection"
+    return None
+
+def _fields(source, keys):
+    """Stripped string values for keys from a mapping ('' if absent).
+
+    Only strings and integers are accepted; anything else (true, 1.0, lists...) raises ValueError
+    rather than being stringified into something that looks valid.
+    """
+    values = []
+    for key in keys:
+        value = source.get(key)
+        if value is None:
+            values.append("")
+        elif isinstance(value, str) or (isinstance(value, int) and not isinstance(value, bool)):
+            values.append(str(value).strip())
+        else:
+            raise ValueError(f"{key} must be a string or an integer")
+    return values
+
+def _request_source():
+    """The JSON object body or the form, whichever the request carries; a JSON body that isn't an object counts as empty."""
+    if request.is_json:
+        data = request.get_json(silent=True)
+        return data if isinstance(data, dict) else {}
+    return request.form
+
+def _request_fields(*keys):
+    """Stripped string values for keys from the JSON body or the form ('' if absent); ValueError as in _fields."""
+    return _fields(_request_source(), keys)
+
+def _safe_int(value):
+    """int(value) for a decimal string (optionally signed), else None; bad input never raises."""
+    value = value.strip() if value else ""
+    digits = value[1:] if value[:1] in ("+", "-") else value
+    return int(value) if digits.isdecimal() else None
+
+def _parse_iso_date(value):
+    """Parse a strict YYYY-MM-DD string into a date, raising ValueError for anything else."""
+    if not _ISO_DATE.fullmatch(value):
+        raise ValueError(f"not a YYYY-MM-DD date: {value!r}")
+    return date.fromisoformat(value)
+
+def _is_iso_date(value):
+    """True if value is a real YYYY-MM-DD date; malformed strings are rejected by the regex without raising."""
+    if not _ISO_DATE.fullmatch(value):
+        return False
+    try:
+        date.fromisoformat(value)
+    except ValueError:
+        return False
+    return True
+
+def _today_iso():
+    """Today's date as YYYY-MM-DD, computed once per request."""
+    if "today_iso" not in g:
+        g.today_iso = date.today().isoformat()
+    return g.today_iso
+
+def _get(endpoint, params=None, refresh=False):
+    """GET JSON from ORDS endpoint. endpoint is like 'employees/get'.
+
+    refresh=True skips a cached copy but still stores the fresh response.
+    """
     if MOCK:
         return mock_get(endpoint, params)
+    ttl = _CACHED_ENDPOINTS.get(endpoint, 0)
+    cacheable = ttl > 0
+    if cacheable:
+        key = _cache_key(endpoint, params)
+        generation = _cache_generation(endpoint)
+    if cacheable and not refresh:
+        cached = _cache_lookup(key)
+        if cached is not None:
+            return cached
     url = f"{BASE_URL.rstrip('/')}/{endpoint.lstrip('/')}"
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-        "Accept": "application/json",
-        "Accept-Language": "en-US,en;q=0.9",
-        "Accept-Encoding": "gzip, deflate, br",
-        "Connection": "keep-alive"
-    }
     try:
-        print(f"[APEX GET] URL: {url} PARAMS: {params}")
-        r = requests.get(url, params=params, headers=headers, timeout=30, verify=True)
-        print(f"[APEX GET] status: {r.status_code}")
-        print(f"[APEX GET] response headers: {dict(r.headers)}")
+        logger.debug("[APEX GET] URL: %s PARAMS: %s", url, params)
+        r = _APEX_SESSION.get(url, params=params, timeout=_APEX_TIMEOUT, verify=True)
+        logger.debug("[APEX GET] status: %s", r.status_code)
+        logger.debug("[APEX GET] response headers: %s", r.headers)
         r.raise_for_status()
-        return r.json()
+        data = orjson.loads(r.content)
+        if cacheable:
+            _cache_store(key, data, ttl, generation)
+        return data
     except requests.exceptions.Timeout as e:
-        print("APEX Timeout Error:", e)
+        logger.warning("APEX Timeout Error: %s", e)
         return {"error": "Oracle APEX service took too long to respond", "ok": False}
     except requests.exceptions.ConnectionError as e:
-        print("APEX Connection Error:", e)
+        logger.warning("APEX Connection Error: %s", e)
         return {"error": "Unable to reach APEX", "ok": False}
     except Exception as e:
         text = getattr(e, 'response', None) and getattr(e.response, 'text', None)
-        print("APEX GET unexpected:", str(e), text)
+        logger.warning("APEX GET unexpected: %s %s", e, text)
         return {"error": str(e), "ok": False}
 
 def _post(endpoint, params=None):
@@ -202,58 +423,191 @@ def _post(endpoint, params=None):
     if MOCK:
         return mock_post(endpoint, params)
     url = f"{BASE_URL.rstrip('/')}/{endpoint.lstrip('/')}"
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-        "Accept": "application/json",
-        "Accept-Language": "en-US,en;q=0.9",
-        "Accept-Encoding": "gzip, deflate, br",
-        "Connection": "keep-alive"
-    }
     try:
-        print(f"[APEX POST] URL: {url} PARAMS: {params}")
-        r = requests.post(url, params=params, headers=headers, timeout=30, verify=True)
-        print(f"[APEX POST] status: {r.status_code}")
+        logger.debug("[APEX POST] URL: %s PARAMS: %s", url, params)
+        r = _APEX_SESSION.post(url, params=params, timeout=_APEX_TIMEOUT, verify=True)
+        logger.debug("[APEX POST] status: %s", r.status_code)
         r.raise_for_status()
         try:
-            return r.json()
+            return orjson.loads(r.content)
         except ValueError:
             return {"text": r.text}
     except requests.exceptions.Timeout as e:
-        print("APEX Timeout Error:", e)
+        logger.warning("APEX Timeout Error: %s", e)
         return {"error": "Oracle APEX service took too long to respond", "ok": False}
     except Exception as e:
-        print("APEX POST unexpected:", e)
+        logger.warning("APEX POST unexpected: %s", e)
         return {"error": str(e), "ok": False}
+    finally:
+        # Writes make any cached reads of the same resource stale
+        _invalidate_cache(endpoint)
 
 def _put(endpoint, params=None):
     """PUT to ORDS endpoint. endpoint is like 'employees/update'."""
     if MOCK:
         return mock_put(endpoint, params)
     url = f"{BASE_URL.rstrip('/')}/{endpoint.lstrip('/')}"
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-        "Accept": "application/json",
-        "Accept-Language": "en-US,en;q=0.9",
-        "Accept-Encoding": "gzip, deflate, br",
-        "Connection": "keep-alive"
-    }
     try:
-        print(f"[APEX PUT] URL: {url} PARAMS: {params}")
-        r = requests.put(url, params=params, headers=headers, timeout=30, verify=True)
-        print(f"[APEX PUT] status: {r.status_code}")
+        logger.debug("[APEX PUT] URL: %s PARAMS: %s", url, params)
+        r = _APEX_SESSION.put(url, params=params, timeout=_APEX_TIMEOUT, verify=True)
+        logger.debug("[APEX PUT] status: %s", r.status_code)
         r.raise_for_status()
         try:
-            return r.json()
+            return orjson.loads(r.content)
         except ValueError:
             return {"text": r.text}
     except requests.exceptions.Timeout as e:
-        print("APEX Timeout Error:", e)
+        logger.warning("APEX Timeout Error: %s", e)
         return {"error": "Oracle APEX service took too long to respond", "ok": False}
     except Exception as e:
-        print("APEX PUT unexpected:", e)
+        logger.warning("APEX PUT unexpected: %s", e)
         return {"error": str(e), "ok": False}
+    finally:
+        # Writes make any cached reads of the same resource stale
+        _invalidate_cache(endpoint)
+
+def _get_one(endpoint, key, value, **params):
+    """The row of an ORDS GET whose key equals value: (row, None), (None, None) when no row matches, or (None, error) if the call failed.
+
+    ORDS may ignore the filter params, so the row is picked by its id rather than taken as items[0].
+    """
+    resp = _get(endpoint, params=params)
+    if isinstance(resp, dict) and resp.get("error"):
+        return None, resp["error"]
+    return _find_row(resp, key, value), None
+
+def _items_or_mock(endpoint, resp, params=None):
+    """Rows of an ORDS GET response, or the sample rows for the same query if APEX failed."""
+    if isinstance(resp, dict) and resp.get("error"):
+        logger.warning("Oracle APEX %s failed: %s, using mock data", endpoint, resp['error'])
+        resp = mock_get(endpoint, params)
+    return resp.get("items", []) if isinstance(resp, dict) else []
+
+def _get_items(endpoint, params=None):
+    """_get's rows for endpoint, with the mock fallback; answered from the GET cache where the endpoint is cached."""
+    return _items_or_mock(endpoint, _get(endpoint, params=params), params)
+
+def _find_row(resp, key, value):
+    """The row of an ORDS GET response whose key equals value, or None (also for failed responses)."""
+    items = resp.get("items") if isinstance(resp, dict) else None
+    return next((row for row in items if row.get(key) == value), None) if items else None
 
 # ---- Mock data (if BASE_URL unreachable, for demos) ----
+# Static sample rows shared by every mock_get call; callers only read them
+MOCK_EMPLOYEES = (
+    {"t_empid": 114, "t_emp_fname": "Candice", "t_emp_lname": "Adams", "t_emp_dept": "Legal"},
+    {"t_empid": 116, "t_emp_fname": "Peter", "t_emp_lname": "Botha", "t_emp_dept": "Operations"},
+    {"t_empid": 109, "t_emp_fname": "Jessica", "t_emp_lname": "Brown", "t_emp_dept": "Finance"},
+    {"t_empid": 61, "t_emp_fname": "Ayakha", "t_emp_lname": "David", "t_emp_dept": "Finance"},
+    {"t_empid": 105, "t_emp_fname": "Nomsa", "t_emp_lname": "Dlamini", "t_emp_dept": "R&D"},
+    {"t_empid": 3, "t_emp_fname": "Sipho", "t_emp_lname": "Dlamini", "t_emp_dept": "IT"},
+    {"t_empid": 101, "t_emp_fname": "Sarah", "t_emp_lname": "Johnson", "t_emp_dept": "Finance"},
+    {"t_empid": 115, "t_emp_fname": "Neo", "t_emp_lname": "Khumalo", "t_emp_dept": "Finance"},
+    {"t_empid": 111, "t_emp_fname": "Khanyi", "t_emp_lname": "Mahlangu", "t_emp_dept": "HR"},
+    {"t_empid": 1, "t_emp_fname": "Thabo", "t_emp_lname": "Mokoena", "t_emp_dept": "R&D"},
+    {"t_empid": 102, "t_emp_fname": "David", "t_emp_lname": "Mokoena", "t_emp_dept": "IT"},
+    {"t_empid": 120, "t_emp_fname": "Rebecca", "t_emp_lname": "Morris", "t_emp_dept": "Marketing"},
+    {"t_empid": 4, "t_emp_fname": "Lerato", "t_emp_lname": "Ndlovu", "t_emp_dept": "HPC"},
+    {"t_empid": 117, "t_emp_fname": "Linda", "t_emp_lname": "Nguyen", "t_emp_dept": "Support"},
+    {"t_empid": 21, "t_emp_fname": "Sangesonke", "t_emp_lname": "Njameni", "t_emp_dept": "Q&A"},
+    {"t_empid": 41, "t_emp_fname": "Zama", "t_emp_lname": "Nkosi", "t_emp_dept": "Dev"},
+    {"t_empid": 2, "t_emp_fname": "Aisha", "t_emp_lname": "Peters", "t_emp_dept": "QA"},
+    {"t_empid": 110, "t_emp_fname": "Michael", "t_emp_lname": "Peterson", "t_emp_dept": "IT"},
+    {"t_empid": 107, "t_emp_fname": "Emily", "t_emp_lname": "Smith", "t_emp_dept": "QA"},
+    {"t_empid": 118, "t_emp_fname": "Ashley", "t_emp_lname": "Taylor", "t_emp_dept": "QA"},
+    {"t_empid": 112, "t_emp_fname": "Daniel", "t_emp_lname": "White", "t_emp_dept": "Logistics"},
+    {"t_empid": 104, "t_emp_fname": "John", "t_emp_lname": "Williams", "t_emp_dept": "Marketing"}
+)
+
+MOCK_INVENTORY = (
+    {"t_item_id": 1, "t_item_name": "Raspberry Pi 4 Model B", "t_item_category": "Electronics", "t_item_quantity": 5},
+    {"t_item_id": 2, "t_item_name": "Arduino Uno R3", "t_item_category": "Electronics", "t_item_quantity": 3},
+    {"t_item_id": 3, "t_item_name": "ESP32 Development Board", "t_item_category": "Electronics", "t_item_quantity": 0},
+    {"t_item_id": 4, "t_item_name": "Soldering Iron Kit", "t_item_category": "Tools", "t_item_quantity": 2},
+    {"t_item_id": 5, "t_item_name": "Digital Oscilloscope", "t_item_category": "Electronics", "t_item_quantity": 1},
+    {"t_item_id": 6, "t_item_name": "3D Printer", "t_item_category": "Electronics", "t_item_quantity": 0},
+    {"t_item_id": 21, "t_item_name": "Playstation", "t_item_category": "Gaming", "t_item_quantity": 1}
+)
+
+MOCK_USAGE = (
+    {"t_booking_id": 1, "t_employee_id": 1, "t_item_id": 1, "t_item_name": "Raspberry Pi 4 Model B",
+     "t_booking_date": "2025-08-30", "t_return_date": NOT_RETURNED, "status": "Active"},
+    {"t_booking_id": 2, "t_employee_id": 2, "t_item_id": 4, "t_item_name": "Soldering Iron Kit",
+     "t_booking_date": "2025-08-29", "t_return_date": "2025-09-05", "status": "Returned"}
+)
+
+@lru_cache(maxsize=1)
+def _mock_booking_index(today):
+    """Build the sample bookings for `today` plus lookup structures for mock_get.
+
+    Returns (bookings, by_employee, by_date): by_employee maps t_employee_id to that
+    employee's bookings and by_date holds all bookings sorted by t_booking_date; both
+    keep a parallel list of booking dates for bisecting date ranges.
+    """
+    # ISO date strings relative to today, formatted once per offset used below
+    days_ago = {n: (today - timedelta(days=n)).isoformat() for n in (0, 1, 2, 3, 4, 5, 6, 7, 8, 10, 12, 15, 18, 20, 25, 30)}
+    
+    # Enhanced sample data for demo with more variety and realistic dates
+    bookings = [
+        # Recent bookings (some overdue, some current)
+            {"t_booking_id": 1, "t_inventory_id": 1, "t_item_name": "Raspberry Pi 4 Model B",
+             "t_employee_id": 1, "employee_name": "Thabo Mokoena",
+         "t_booking_date": days_ago[10], "t_return_date": NOT_RETURNED },
+            {"t_booking_id": 2, "t_inventory_id": 2, "t_item_name": "Arduino Uno R3",
+         "t_employee_id": 101, "employee_name": "Sarah Johnson",
+         "t_booking_date": days_ago[5], "t_return_date": days_ago[1] },
+            {"t_booking_id": 3, "t_inventory_id": 3, "t_item_name": "ESP32 Development Board",
+         "t_employee_id": 3, "employee_name": "Sipho Dlamini",
+         "t_booking_date": days_ago[3], "t_return_date": days_ago[1] },
+            {"t_booking_id": 4, "t_inventory_id": 4, "t_item_name": "Soldering Iron Kit",
+         "t_employee_id": 2, "employee_name": "Aisha Peters",
+         "t_booking_date": days_ago[8], "t_return_date": NOT_RETURNED },
+        {"t_booking_id": 5, "t_inventory_id": 5, "t_item_name": "Digital Oscilloscope",
+         "t_employee_id": 110, "employee_name": "Michael Peterson",
+         "t_booking_date": days_ago[12], "t_return_date": NOT_RETURNED },
+        {"t_booking_id": 6, "t_inventory_id": 6, "t_item_name": "3D Printer",
+         "t_employee_id": 4, "employee_name": "Lerato Ndlovu",
+         "t_booking_date": days_ago[2], "t_return_date": days_ago[0] },
+        {"t_booking_id": 7, "t_inventory_id": 21, "t_item_name": "Playstation",
+         "t_employee_id": 21, "employee_name": "Sangesonke Njameni",
+         "t_booking_date": days_ago[15], "t_return_date": NOT_RETURNED },
+        {"t_booking_id": 8, "t_inventory_id": 2, "t_item_name": "Arduino Mega 2560",
+             "t_employee_id": 2, "employee_name": "Sarah Johnson",
+         "t_booking_date": days_ago[20], "t_return_date": days_ago[5] },
+        {"t_booking_id": 9, "t_inventory_id": 3, "t_item_name": "Fluke Multimeter 87V",
+         "t_employee_id": 3, "employee_name": "Mike Chen",
+         "t_booking_date": days_ago[25], "t_return_date": NOT_RETURNED },
+        {"t_booking_id": 10, "t_inventory_id": 4, "t_item_name": "Workstation Xeon W-2295",
+         "t_employee_id": 4, "employee_name": "Lisa Wang",
+         "t_booking_date": days_ago[30], "t_return_date": days_ago[10] },
+        # Additional bookings for more data
+        {"t_booking_id": 11, "t_inventory_id": 1, "t_item_name": "Raspberry Pi 4 Model B",
+         "t_employee_id": 2, "employee_name": "Sarah Johnson",
+         "t_booking_date": days_ago[1], "t_return_date": NOT_RETURNED },
+        {"t_booking_id": 12, "t_inventory_id": 5, "t_item_name": "Digital Oscilloscope",
+         "t_employee_id": 4, "employee_name": "Lisa Wang",
+         "t_booking_date": days_ago[6], "t_return_date": NOT_RETURNED },
+        {"t_booking_id": 13, "t_inventory_id": 21, "t_item_name": "Playstation",
+         "t_employee_id": 1, "employee_name": "Thabo Mokoena",
+         "t_booking_date": days_ago[4], "t_return_date": days_ago[0] },
+        {"t_booking_id": 14, "t_inventory_id": 6, "t_item_name": "3D Printer",
+         "t_employee_id": 3, "employee_name": "Mike Chen",
+         "t_booking_date": days_ago[18], "t_return_date": NOT_RETURNED },
+        {"t_booking_id": 15, "t_inventory_id": 2, "t_item_name": "Arduino Uno R3",
+         "t_employee_id": 21, "employee_name": "Alex Rodriguez",
+         "t_booking_date": days_ago[7], "t_return_date": NOT_RETURNED }
+    ]
+    
+    def _date_sorted(rows):
+        rows = sorted(rows, key=itemgetter("t_booking_date"))
+        return rows, [b["t_booking_date"] for b in rows]
+    
+    grouped = defaultdict(list)
+    for booking in bookings:
+        grouped[booking["t_employee_id"]].append(booking)
+    by_employee = {emp_id: _date_sorted(rows) for emp_id, rows in grouped.items()}
+    return bookings, by_employee, _date_sorted(bookings)
+
 def mock_get(endpoint, params):
     if endpoint == "inventory_booking/get_date_data":
         empid = str(params.get("empid")) if params and params.get("empid") else None
@@ -266,138 +620,56 @@ def mock_get(endpoint, params):
             start_date = None
             end_date = None
         
-        # Enhanced sample data for demo with more variety and realistic dates
-        from datetime import date, timedelta
-        today = date.today()
-        
-        all_bookings = [
-            # Recent bookings (some overdue, some current)
-                {"t_booking_id": 1, "t_inventory_id": 1, "t_item_name": "Raspberry Pi 4 Model B",
-                 "t_employee_id": 1, "employee_name": "Thabo Mokoena",
-             "t_booking_date": (today - timedelta(days=10)).strftime("%Y-%m-%d"), "t_return_date": "Not Returned" },
-                {"t_booking_id": 2, "t_inventory_id": 2, "t_item_name": "Arduino Uno R3",
-             "t_employee_id": 101, "employee_name": "Sarah Johnson",
-             "t_booking_date": (today - timedelta(days=5)).strftime("%Y-%m-%d"), "t_return_date": (today - timedelta(days=1)).strftime("%Y-%m-%d") },
-                {"t_booking_id": 3, "t_inventory_id": 3, "t_item_name": "ESP32 Development Board",
-             "t_employee_id": 3, "employee_name": "Sipho Dlamini",
-             "t_booking_date": (today - timedelta(days=3)).strftime("%Y-%m-%d"), "t_return_date": (today - timedelta(days=1)).strftime("%Y-%m-%d") },
-                {"t_booking_id": 4, "t_inventory_id": 4, "t_item_name": "Soldering Iron Kit",
-             "t_employee_id": 2, "employee_name": "Aisha Peters",
-             "t_booking_date": (today - timedelta(days=8)).strftime("%Y-%m-%d"), "t_return_date": "Not Returned" },
-            {"t_booking_id": 5, "t_inventory_id": 5, "t_item_name": "Digital Oscilloscope",
-             "t_employee_id": 110, "employee_name": "Michael Peterson",
-             "t_booking_date": (today - timedelta(days=12)).strftime("%Y-%m-%d"), "t_return_date": "Not Returned" },
-            {"t_booking_id": 6, "t_inventory_id": 6, "t_item_name": "3D Printer",
-             "t_employee_id": 4, "employee_name": "Lerato Ndlovu",
-             "t_booking_date": (today - timedelta(days=2)).strftime("%Y-%m-%d"), "t_return_date": today.strftime("%Y-%m-%d") },
-            {"t_booking_id": 7, "t_inventory_id": 21, "t_item_name": "Playstation",
-             "t_employee_id": 21, "employee_name": "Sangesonke Njameni",
-             "t_booking_date": (today - timedelta(days=15)).strftime("%Y-%m-%d"), "t_return_date": "Not Returned" },
-            {"t_booking_id": 8, "t_inventory_id": 2, "t_item_name": "Arduino Mega 2560",
-                 "t_employee_id": 2, "employee_name": "Sarah Johnson",
-             "t_booking_date": (today - timedelta(days=20)).strftime("%Y-%m-%d"), "t_return_date": (today - timedelta(days=5)).strftime("%Y-%m-%d") },
-            {"t_booking_id": 9, "t_inventory_id": 3, "t_item_name": "Fluke Multimeter 87V",
-             "t_employee_id": 3, "employee_name": "Mike Chen",
-             "t_booking_date": (today - timedelta(days=25)).strftime("%Y-%m-%d"), "t_return_date": "Not Returned" },
-            {"t_booking_id": 10, "t_inventory_id": 4, "t_item_name": "Workstation Xeon W-2295",
-             "t_employee_id": 4, "employee_name": "Lisa Wang",
-             "t_booking_date": (today - timedelta(days=30)).strftime("%Y-%m-%d"), "t_return_date": (today - timedelta(days=10)).strftime("%Y-%m-%d") },
-            # Additional bookings for more data
-            {"t_booking_id": 11, "t_inventory_id": 1, "t_item_name": "Raspberry Pi 4 Model B",
-             "t_employee_id": 2, "employee_name": "Sarah Johnson",
-             "t_booking_date": (today - timedelta(days=1)).strftime("%Y-%m-%d"), "t_return_date": "Not Returned" },
-            {"t_booking_id": 12, "t_inventory_id": 5, "t_item_name": "Digital Oscilloscope",
-             "t_employee_id": 4, "employee_name": "Lisa Wang",
-             "t_booking_date": (today - timedelta(days=6)).strftime("%Y-%m-%d"), "t_return_date": "Not Returned" },
-            {"t_booking_id": 13, "t_inventory_id": 21, "t_item_name": "Playstation",
-             "t_employee_id": 1, "employee_name": "Thabo Mokoena",
-             "t_booking_date": (today - timedelta(days=4)).strftime("%Y-%m-%d"), "t_return_date": today.strftime("%Y-%m-%d") },
-            {"t_booking_id": 14, "t_inventory_id": 6, "t_item_name": "3D Printer",
-             "t_employee_id": 3, "employee_name": "Mike Chen",
-             "t_booking_date": (today - timedelta(days=18)).strftime("%Y-%m-%d"), "t_return_date": "Not Returned" },
-            {"t_booking_id": 15, "t_inventory_id": 2, "t_item_name": "Arduino Uno R3",
-             "t_employee_id": 21, "employee_name": "Alex Rodriguez",
-             "t_booking_date": (today - timedelta(days=7)).strftime("%Y-%m-%d"), "t_return_date": "Not Returned" }
-        ]
-        
-        print(f"[MOCK DEBUG] empid: {empid}, start_date: {start_date}, end_date: {end_date}")
-        print(f"[MOCK DEBUG] Total bookings before filtering: {len(all_bookings)}")
+        bookings, by_employee, by_date = _mock_booking_index(date.today())
+        logger.debug("[MOCK DEBUG] empid: %s, start_date: %s, end_date: %s", empid, start_date, end_date)
+        logger.debug("[MOCK DEBUG] Total bookings before filtering: %d", len(bookings))
         
         # Filter by employee ID if specified
         if empid and empid != "None" and empid != "" and empid != "all":
-            all_bookings = [b for b in all_bookings if str(b["t_employee_id"]) == str(empid)]
-            print(f"[MOCK DEBUG] After empid filter: {len(all_bookings)}")
+            try:
+                rows, dates = by_employee.get(int(empid), ([], []))
+            except ValueError:
+                rows, dates = [], []
+            logger.debug("[MOCK DEBUG] After empid filter: %d", len(rows))
         else:
-            print(f"[MOCK DEBUG] No empid filter applied, showing all {len(all_bookings)} bookings")
+            rows, dates = by_date
+            logger.debug("[MOCK DEBUG] No empid filter applied, showing all %d bookings", len(rows))
         
         # Filter by date range if specified (simplified mock filtering)
-        if start_date:
-            all_bookings = [b for b in all_bookings if b["t_booking_date"] >= start_date]
-            print(f"[MOCK DEBUG] After start_date filter: {len(all_bookings)}")
-        if end_date:
-            all_bookings = [b for b in all_bookings if b["t_booking_date"] <= end_date]
-            print(f"[MOCK DEBUG] After end_date filter: {len(all_bookings)}")
+        if start_date or end_date:
+            lo = bisect_left(dates, start_date) if start_date else 0
+            hi = bisect_right(dates, end_date) if end_date else len(dates)
+            rows = rows[lo:hi]
+            logger.debug("[MOCK DEBUG] After date filter: %d", len(rows))
+        
+        # Restore booking order and hand out copies so callers can annotate rows
+        # without touching the shared sample data
+        all_bookings = [dict(b) for b in sorted(rows, key=itemgetter("t_booking_id"))]
         
         result = {"items": all_bookings, "count": len(all_bookings)}
-        print(f"[MOCK DEBUG] Final result: {result}")
+        logger.debug("[MOCK DEBUG] Final result: %s", result)
         return result
     
     elif endpoint == "employees/get":
-        return {"items": [
-            {"t_empid": 114, "t_emp_fname": "Candice", "t_emp_lname": "Adams", "t_emp_dept": "Legal"},
-            {"t_empid": 116, "t_emp_fname": "Peter", "t_emp_lname": "Botha", "t_emp_dept": "Operations"},
-            {"t_empid": 109, "t_emp_fname": "Jessica", "t_emp_lname": "Brown", "t_emp_dept": "Finance"},
-            {"t_empid": 61, "t_emp_fname": "Ayakha", "t_emp_lname": "David", "t_emp_dept": "Finance"},
-            {"t_empid": 105, "t_emp_fname": "Nomsa", "t_emp_lname": "Dlamini", "t_emp_dept": "R&D"},
-            {"t_empid": 3, "t_emp_fname": "Sipho", "t_emp_lname": "Dlamini", "t_emp_dept": "IT"},
-            {"t_empid": 101, "t_emp_fname": "Sarah", "t_emp_lname": "Johnson", "t_emp_dept": "Finance"},
-            {"t_empid": 115, "t_emp_fname": "Neo", "t_emp_lname": "Khumalo", "t_emp_dept": "Finance"},
-            {"t_empid": 111, "t_emp_fname": "Khanyi", "t_emp_lname": "Mahlangu", "t_emp_dept": "HR"},
-            {"t_empid": 1, "t_emp_fname": "Thabo", "t_emp_lname": "Mokoena", "t_emp_dept": "R&D"},
-            {"t_empid": 102, "t_emp_fname": "David", "t_emp_lname": "Mokoena", "t_emp_dept": "IT"},
-            {"t_empid": 120, "t_emp_fname": "Rebecca", "t_emp_lname": "Morris", "t_emp_dept": "Marketing"},
-            {"t_empid": 4, "t_emp_fname": "Lerato", "t_emp_lname": "Ndlovu", "t_emp_dept": "HPC"},
-            {"t_empid": 117, "t_emp_fname": "Linda", "t_emp_lname": "Nguyen", "t_emp_dept": "Support"},
-            {"t_empid": 21, "t_emp_fname": "Sangesonke", "t_emp_lname": "Njameni", "t_emp_dept": "Q&A"},
-            {"t_empid": 41, "t_emp_fname": "Zama", "t_emp_lname": "Nkosi", "t_emp_dept": "Dev"},
-            {"t_empid": 2, "t_emp_fname": "Aisha", "t_emp_lname": "Peters", "t_emp_dept": "QA"},
-            {"t_empid": 110, "t_emp_fname": "Michael", "t_emp_lname": "Peterson", "t_emp_dept": "IT"},
-            {"t_empid": 107, "t_emp_fname": "Emily", "t_emp_lname": "Smith", "t_emp_dept": "QA"},
-            {"t_empid": 118, "t_emp_fname": "Ashley", "t_emp_lname": "Taylor", "t_emp_dept": "QA"},
-            {"t_empid": 112, "t_emp_fname": "Daniel", "t_emp_lname": "White", "t_emp_dept": "Logistics"},
-            {"t_empid": 104, "t_emp_fname": "John", "t_emp_lname": "Williams", "t_emp_dept": "Marketing"}
-        ], "count": 22}
+        return {"items": MOCK_EMPLOYEES, "count": len(MOCK_EMPLOYEES)}
     
     elif endpoint == "inventory/get":
-        global mock_inventory_changes
-        
-        # Base inventory data
-        base_inventory = [
-            {"t_item_id": 1, "t_item_name": "Raspberry Pi 4 Model B", "t_item_category": "Electronics", "t_item_quantity": 5},
-            {"t_item_id": 2, "t_item_name": "Arduino Uno R3", "t_item_category": "Electronics", "t_item_quantity": 3},
-            {"t_item_id": 3, "t_item_name": "ESP32 Development Board", "t_item_category": "Electronics", "t_item_quantity": 0},
-            {"t_item_id": 4, "t_item_name": "Soldering Iron Kit", "t_item_category": "Tools", "t_item_quantity": 2},
-            {"t_item_id": 5, "t_item_name": "Digital Oscilloscope", "t_item_category": "Electronics", "t_item_quantity": 1},
-            {"t_item_id": 6, "t_item_name": "3D Printer", "t_item_category": "Electronics", "t_item_quantity": 0},
-            {"t_item_id": 21, "t_item_name": "Playstation", "t_item_category": "Gaming", "t_item_quantity": 1}
-        ]
-        
-        # Apply inventory changes if any
-        for item in base_inventory:
+        if not mock_inventory_changes:
+            return {"items": MOCK_INVENTORY, "count": len(MOCK_INVENTORY)}
+        
+        # Apply inventory changes to copies so the base data stays untouched
+        base_inventory = []
+        for item in MOCK_INVENTORY:
             item_id = item["t_item_id"]
             if item_id in mock_inventory_changes:
-                item["t_item_quantity"] = mock_inventory_changes[item_id]
-                print(f"[MOCK GET] Applied inventory change for item {item_id}: quantity = {mock_inventory_changes[item_id]}")
+                item = dict(item, t_item_quantity=mock_inventory_changes[item_id])
+                logger.debug("[MOCK GET] Applied inventory change for item %s: quantity = %s", item_id, mock_inventory_changes[item_id])
+            base_inventory.append(item)
         
         return {"items": base_inventory, "count": len(base_inventory)}
     
     elif endpoint == "usage/get":
-        return {"items": [
-            {"t_booking_id": 1, "t_employee_id": 1, "t_item_id": 1, "t_item_name": "Raspberry Pi 4 Model B",
-             "t_booking_date": "2025-08-30", "t_return_date": "Not Returned", "status": "Active"},
-            {"t_booking_id": 2, "t_employee_id": 2, "t_item_id": 4, "t_item_name": "Soldering Iron Kit",
-             "t_booking_date": "2025-08-29", "t_return_date": "2025-09-05", "status": "Returned"}
-        ], "count": 2}
+        return {"items": MOCK_USAGE, "count": len(MOCK_USAGE)}
     
     return {"items": [], "count": 0}
 
@@ -437,43 +709,61 @@ def mock_put(endpoint, params):
         if item_id and new_quantity is not None:
             # Track the inventory change
             mock_inventory_changes[int(item_id)] = int(new_quantity)
-            print(f"[MOCK PUT] Updating inventory item {item_id} to quantity {new_quantity}")
-            print(f"[MOCK PUT] Current inventory changes: {mock_inventory_changes}")
+            logger.debug("[MOCK PUT] Updating inventory item %s to quantity %s", item_id, new_quantity)
+            logger.debug("[MOCK PUT] Current inventory changes: %s", mock_inventory_changes)
         
         # Simulate successful update
         return {"updated_rows": 1, "status": "success", "item_id": item_id, "new_quantity": new_quantity}
     
     return {"updated_rows": 0, "status": "no_change"}
 
+_activity_date = itemgetter("date")
+
+# Worker pool for independent APEX fetches that a view can overlap instead of issuing back to back.
+# Only for read-only pages: a value that feeds a write (e.g. a quantity to bump) is read after the
+# writes it depends on, never prefetched alongside them.
+_APEX_EXECUTOR = ThreadPoolExecutor(max_workers=8)
+
+def _submit_get(endpoint, params=None, refresh=False):
+    """Start _get on _APEX_EXECUTOR, or resolve straight from the GET cache so a hit costs no thread handoff.
+
+    refresh=True always goes to APEX; use it for reads that feed a write.
+    """
+    if refresh:
+        return _APEX_EXECUTOR.submit(_get, endpoint, params=params, refresh=True)
+    if not MOCK and endpoint in _CACHED_ENDPOINTS:
+        cached = _cache_lookup(_cache_key(endpoint, params))
+        if cached is not None:
+            future = Future()
+            future.set_result(cached)
+            return future
+    return _APEX_EXECUTOR.submit(_get, endpoint, params=params)
+
 def get_dashboard_data():
     """Get dashboard data including KPIs, recent activity, and low stock alerts."""
     try:
         # Get data from live APEX sources (with mock fallback)
+        # The three fetches are independent, so issue them concurrently
+        employees_future = _submit_get("employees/get")
+        inventory_future = _submit_get("inventory/get")
+        # Get all bookings (no empid filter to get all)
+        bookings_future = _submit_get("inventory_booking/get_date_data", params={})
+        
         # Get all employees
-        employees_resp = _get("employees/get")
-        if isinstance(employees_resp, dict) and employees_resp.get("error"):
-            employees_resp = mock_get("employees/get", None)
-        total_employees = len(employees_resp.get("items", []))
+        total_employees = len(_items_or_mock("employees/get", employees_future.result()))
         
         # Get all inventory items
-        inventory_resp = _get("inventory/get")
-        if isinstance(inventory_resp, dict) and inventory_resp.get("error"):
-            inventory_resp = mock_get("inventory/get", None)
-        total_items = len(inventory_resp.get("items", []))
-        
-        # Get all bookings (no empid filter to get all)
-        bookings_resp = _get("inventory_booking/get_date_data", params={})
-        if isinstance(bookings_resp, dict) and bookings_resp.get("error"):
-            bookings_resp = mock_get("inventory_booking/get_date_data", None)
-        all_bookings = bookings_resp.get("items", [])
+        inventory_items = _items_or_mock("inventory/get", inventory_future.result())
+        total_items = len(inventory_items)
         
-        # Calculate currently issued (bookings with "Not Returned")
-        currently_issued = len([b for b in all_bookings if b.get("t_return_date") == "Not Returned"])
+        all_bookings = _items_or_mock("inventory_booking/get_date_data", bookings_future.result())
         
         # Calculate recent bookings (all bookings)
         recent_bookings = len(all_bookings)
         
-        # Create recent activity from bookings
+        # Single pass: count currently issued (bookings with "Not Returned")
+        # and create recent activity from bookings
+        currently_issued = 0
         recent_activity = []
         for booking in all_bookings:
             # Add booking activity
@@ -485,23 +775,25 @@ def get_dashboard_data():
                 "booking_id": booking.get("t_booking_id")
             })
             
-            # Add return activity if returned
-            if booking.get("t_return_date") != "Not Returned":
+            return_date = booking.get("t_return_date")
+            if return_date == NOT_RETURNED:
+                currently_issued += 1
+            else:
+                # Add return activity if returned
                 recent_activity.append({
                     "type": "return",
                     "item_name": booking.get("t_item_name", "Unknown Item"),
                     "employee_id": booking.get("t_employee_id"),
-                    "date": booking.get("t_return_date"),
+                    "date": return_date,
                     "booking_id": booking.get("t_booking_id")
                 })
         
-        # Sort recent activity by date (most recent first)
-        recent_activity.sort(key=lambda x: x["date"], reverse=True)
-        recent_activity = recent_activity[:10]  # Limit to 10 most recent
+        # Keep the 10 most recent activities (most recent first) without sorting everything
+        recent_activity = heapq.nlargest(10, recent_activity, key=_activity_date)
         
         # Get low stock alerts from inventory
         low_stock_alerts = []
-        for item in inventory_resp.get("items", []):
+        for item in inventory_items:
             quantity = item.get("t_item_quantity", 0)
             if quantity <= 2:  # Low stock threshold
                 low_stock_alerts.append({
@@ -520,7 +812,7 @@ def get_dashboard_data():
         }
         
     except Exception as e:
-        print(f"Error getting dashboard data: {e}")
+        logger.warning("Error getting dashboard data: %s", e)
         # Return default values if there's an error
         return {
             "total_items": 7,  # From mock data
@@ -531,6 +823,62 @@ def get_dashboard_data():
             "low_stock_alerts": []
         }
 
+def _dashboard_payload(activity_limit, low_stock_alerts=False):
+    """The dashboard KPIs for JSON responses, with the newest activity_limit activities (and low stock alerts if asked)."""
+    dashboard_data = get_dashboard_data()
+    payload = {
+        "total_items": dashboard_data.get("total_items", 0),
+        "currently_issued": dashboard_data.get("currently_issued", 0),
+        "total_employees": dashboard_data.get("total_employees", 0),
+        "recent_bookings": dashboard_data.get("recent_bookings", 0),
+        "recent_activity": dashboard_data.get("recent_activity", [])[:activity_limit]
+    }
+    if low_stock_alerts:
+        payload["low_stock_alerts"] = dashboard_data.get("low_stock_alerts", [])
+    return payload
+
+def render_qr_png(payload, error="l", scale=10, border=4):
+    """Render a QR code for payload and return PNG bytes. Identical payloads are served from memory."""
+    # lru_cache keys on how arguments were passed, so always call through positionally:
+    # f(p, error="m") and f(p, "m") then share one entry instead of encoding the image twice
+    return _render_qr_png(payload, error, scale, border)
+
+@lru_cache(maxsize=1024)
+def _render_qr_png(payload, error, scale, border):
+    img_buffer = io.BytesIO()
+    # Two-colour QR rasters barely shrink at higher zlib levels, so favour encode speed
+    segno.make_qr(payload, error=error, boost_error=False).save(
+        img_buffer, kind="png", scale=scale, border=border, compresslevel=1
+    )
+    return img_buffer.getvalue()
+
+def render_qr_data_uri(payload, error="l", scale=10, border=4):
+    """render_qr_png as a data:image/png;base64 URI, cached so repeat payloads skip the encoding too."""
+    return _render_qr_data_uri(payload, error, scale, border)
+
+@lru_cache(maxsize=256)
+def _render_qr_data_uri(payload, error, scale, border):
+    return "data:image/png;base64," + base64.b64encode(_render_qr_png(payload, error, scale, border)).decode()
+
+def conditional_response(payload, render):
+    """Answer 304 Not Modified when the client already holds payload, otherwise call render().
+
+    The ETag is a hash of payload scoped to the current user, so the page is not rendered
+    again when the underlying APEX data has not changed. Responses carrying flashed
+    messages are always rendered and never tagged, so one-off messages are not cached.
+    """
+    if session.get("_flashes"):
+        return render()
+    etag = hashlib.blake2b(orjson.dumps([current_user.get_id(), MOCK, payload]), digest_size=8).hexdigest()
+    if etag in request.if_none_match:
+        response = app.response_class(status=304)
+    else:
+        response = make_response(render())
+    response.set_etag(etag)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
 # ---- Routes ----
 @app.route("/login", methods=["GET", "POST"])
 def login():
@@ -538,9 +886,11 @@ def login():
         username = request.form.get("username", "").strip()
         password = request.form.get("password", "").strip()
         
-        if username in USERS and check_password_hash(USERS[username]["password"], password):
-            user_data = USERS[username]
-            user = User(username, user_data["role"], user_data["employee_id"])
+        # Always run one hash check so response time does not reveal whether the username exists
+        user_data = USERS.get(username)
+        password_ok = verify_password(user_data["password"] if user_data else DUMMY_PASSWORD_HASH, password)
+        if user_data and password_ok:
+            user = _USER_CACHE[username]
             login_user(user)
             
             # Redirect based on role
@@ -577,22 +927,27 @@ def qr_login():
         empid = data.get("empid")
         username = data.get("username")
         
-        target_username = None
-        
         if empid:
-            # Convert empid to string for lookup
-            empid_str = str(empid)
-            if empid_str in EMPLOYEE_USERS:
-                target_username = EMPLOYEE_USERS[empid_str]
-        elif username:
+            # Normalise to an int first so " 104", "0104" and a JSON 104.0 resolve like 104;
+            # only strings need parsing
+            if isinstance(empid, bool):
+                empid_int = None
+            elif isinstance(empid, int):
+                empid_int = empid
+            elif isinstance(empid, float):
+                empid_int = int(empid) if empid.is_integer() else None
+            elif isinstance(empid, str):
+                empid_int = _safe_int(empid)
+            else:
+                empid_int = None
+            target_username = EMPLOYEE_USERS.get(empid_int)
+        else:
             # Direct username lookup
-            if username in USERS:
-                target_username = username
+            target_username = username if username in USERS else None
         
         if target_username:
             # Log the user in
-            user = User(target_username)
-            login_user(user)
+            login_user(_USER_CACHE[target_username])
             return jsonify({
                 "status": "success", 
                 "message": f"Welcome, {target_username}!",
@@ -614,9 +969,10 @@ def qr_login():
 @login_required
 def index():
     # Redirect based on user role
-    if current_user.is_employee():
+    role = current_user.role
+    if role == "employee":
         return redirect(url_for('employee_dashboard'))
-    elif current_user.is_admin():
+    elif role == "admin":
         if request.method == "POST":
             empid = request.form.get("empid", "").strip()
             if not empid:
@@ -656,6 +1012,48 @@ def bookings_by_employee(empid):
     # Redirect to bookings management with employee filter
     return redirect(url_for("bookings_management", empid=empid_int))
 
+# One row of the employee dashboard tables; booked_on is the parsed booking date (or None)
+DashboardBooking = namedtuple(
+    "DashboardBooking",
+    "booking_id inventory_id item_name employee_id booking_date return_date days_out duration booked_on is_returned"
+)
+
+def _dashboard_row(item, today):
+    """Parse one APEX booking row into a DashboardBooking, computing days out and loan duration."""
+    booking_date = None
+    days_out = ""
+    if item.get('t_booking_date'):
+        try:
+            booking_date = date.fromisoformat(item['t_booking_date'])
+            days_out = (today - booking_date).days
+        except (TypeError, ValueError):
+            days_out = 0
+    
+    return_date = item.get('t_return_date', "")
+    is_returned = return_date != NOT_RETURNED
+    duration = ""
+    if is_returned:
+        # Calculate duration for returned items
+        duration = 0
+        if booking_date and return_date:
+            try:
+                duration = (date.fromisoformat(return_date) - booking_date).days
+            except (TypeError, ValueError):
+                pass
+    
+    return DashboardBooking(
+        item.get('t_booking_id', ""),
+        item.get('t_inventory_id', ""),
+        item.get('t_item_name'),
+        item.get('t_employee_id', ""),
+        item.get('t_booking_date', ""),
+        return_date,
+        days_out,
+        duration,
+        booking_date,
+        is_returned,
+    )
+
 @app.route("/dashboard/<empid>")
 @login_required
 def dashboard(empid):
@@ -686,48 +1084,18 @@ def dashboard(empid):
         items = resp.get("items", resp if isinstance(resp, list) else [])
         count = resp.get("count", len(items))
     
-    # Process items for dashboard
-    from datetime import datetime, date
+    # Parse each row once into a flat record; derived fields are computed there rather than written back into the row
+    today = date.today()
+    rows = [_dashboard_row(item, today) for item in items]
     
-    current_bookings = []
-    returned_bookings = []
-    active_count = 0
-    returned_count = 0
-    latest_booking_date = "N/A"
+    # Separate current vs returned
+    current_bookings = [b for b in rows if not b.is_returned]
+    returned_bookings = [b for b in rows if b.is_returned]
+    active_count = len(current_bookings)
+    returned_count = len(returned_bookings)
+    latest_booking = max((b.booked_on for b in rows if b.booked_on), default=None)
     
-    for item in items:
-        # Calculate days out and duration
-        if item.get('t_booking_date'):
-            try:
-                booking_date = datetime.strptime(item['t_booking_date'], '%Y-%m-%d').date()
-                days_out = (date.today() - booking_date).days
-                item['days_out'] = days_out
-                
-                # Track latest booking
-                if latest_booking_date == "N/A" or booking_date > datetime.strptime(latest_booking_date, '%Y-%m-%d').date():
-                    latest_booking_date = item['t_booking_date']
-            except:
-                item['days_out'] = 0
-        
-        # Separate current vs returned
-        if item.get('t_return_date') == 'Not Returned':
-            current_bookings.append(item)
-            active_count += 1
-        else:
-            # Calculate duration for returned items
-            if item.get('t_booking_date') and item.get('t_return_date'):
-                try:
-                    booking_date = datetime.strptime(item['t_booking_date'], '%Y-%m-%d').date()
-                    return_date = datetime.strptime(item['t_return_date'], '%Y-%m-%d').date()
-                    duration = (return_date - booking_date).days
-                    item['duration'] = duration
-                except:
-                    item['duration'] = 0
-            else:
-                item['duration'] = 0
-            
-            returned_bookings.append(item)
-            returned_count += 1
+    latest_booking_date = latest_booking.isoformat() if latest_booking else "N/A"
     
     return render_template("dashboard.html", 
                          empid=empid, 
@@ -750,7 +1118,7 @@ def do_return():
         flash("Booking ID and Employee ID are required.", "danger")
         return redirect(url_for("index"))
     if not returndate:
-        returndate = date.today().isoformat()
+        returndate = _today_iso()
     # Call POST endpoint: inventory_booking/postdata?returndate=YYYY-MM-DD&bookid=...&empid=...
     resp = _post("inventory_booking/postdata", params={"returndate": returndate, "bookid": bookid, "empid": empid})
     # Evaluate response and present result
@@ -774,45 +1142,36 @@ def do_return():
         result_msg = {"raw": str(resp)}
     return render_template("return_result.html", resp=result_msg, bookid=bookid, empid=empid, returndate=returndate)
 
-@app.route("/do_return", methods=["POST"])
-@login_required
-def do_return_api():
-    """API endpoint for returning equipment with proper Oracle APEX integration."""
+def _do_return_result(source):
+    """Validate one return body (JSON object or form) and record it in Oracle APEX; returns (payload, status_code)."""
     try:
-        # Get data from form or JSON
-        if request.is_json:
-            data = request.get_json()
-            empid = data.get("empid", "").strip()
-            bookid = data.get("bookid", "").strip()
-            returndate = data.get("returndate", "").strip()
-        else:
-            empid = request.form.get("empid", "").strip()
-            bookid = request.form.get("bookid", "").strip()
-            returndate = request.form.get("returndate", "").strip()
+        try:
+            empid, bookid, returndate = _fields(source, ("empid", "bookid", "returndate"))
+        except ValueError as e:
+            return {"error": str(e)}, 400
         
         # Validate inputs
         if not empid or not bookid or not returndate:
-            return jsonify({
+            return {
                 "error": "Missing required fields: empid, bookid, and returndate are required"
-            }), 400
+            }, 400
         
         # Validate empid and bookid are numeric
         try:
             empid_int = int(empid)
             bookid_int = int(bookid)
         except ValueError:
-            return jsonify({
+            return {
                 "error": "empid and bookid must be numeric values"
-            }), 400
+            }, 400
         
         # Validate returndate format (basic check)
         try:
-            from datetime import datetime
-            datetime.strptime(returndate, '%Y-%m-%d')
+            _parse_iso_date(returndate)
         except ValueError:
-            return jsonify({
+            return {
                 "error": "returndate must be in YYYY-MM-DD format"
-            }), 400
+            }, 400
         
         # Make POST request to Oracle APEX REST endpoint
         resp = _post("inventory_booking/postdata", params={
@@ -826,47 +1185,73 @@ def do_return_api():
             if resp.get("error"):
                 error_msg = resp.get("error")
                 # Determine appropriate status code based on error type
-                if "timeout" in error_msg.lower() or "took too long" in error_msg.lower():
-                    return jsonify({
+                kind = _apex_error_kind(error_msg)
+                if kind == "timeout":
+                    return {
                         "error": error_msg
-                    }), 504
-                elif "unable to reach" in error_msg.lower() or "connection" in error_msg.lower():
-                    return jsonify({
+                    }, 504
+                elif kind == "connection":
+                    return {
                         "error": error_msg
-                    }), 500
+                    }, 500
                 else:
-                    return jsonify({
+                    return {
                         "error": f"Oracle APEX service error: {error_msg}"
-                    }), 500
+                    }, 500
             
             updated_rows = resp.get("updated_rows")
             if updated_rows == 1:
-                return jsonify({
+                return {
                     "status": "success",
                     "message": "Equipment marked as returned."
-                })
+                }, 200
             elif updated_rows == 0:
-                return jsonify({
+                return {
                     "status": "no_change",
                     "message": "This booking was already returned."
-                })
+                }, 200
             else:
                 # Return the JSON from APEX as-is
-                return jsonify(resp)
+                return resp, 200
         else:
-            return jsonify({
+            return {
                 "error": "Unexpected response format from Oracle APEX service"
-            }), 500
+            }, 500
             
     except Exception as e:
-        return jsonify({
+        return {
             "error": f"Internal server error: {str(e)}"
-        }), 500
+        }, 500
 
-@app.route("/qrcode/<int:booking_id>")
+@app.route("/do_return", methods=["POST"])
 @login_required
-def generate_qrcode(booking_id):
-    """Generate QR code for a specific booking."""
+def do_return_api():
+    """API endpoint for returning equipment with proper Oracle APEX integration."""
+    # Get data from form or JSON
+    payload, status = _do_return_result(_request_source())
+    return jsonify(payload), status
+
+# Each entry is a blocking APEX POST on the request worker, so keep batches small
+DO_RETURN_BATCH_LIMIT = 50
+
+@app.route("/do_return_batch", methods=["POST"])
+@login_required
+def do_return_batch_api():
+    """Process a JSON array of /do_return bodies in one request; returns [{status, body}, ...] in the same order."""
+    cases = request.get_json(silent=True)
+    if not isinstance(cases, list):
+        return jsonify({"error": "Request body must be a JSON array of return objects"}), 400
+    if len(cases) > DO_RETURN_BATCH_LIMIT:
+        return jsonify({"error": f"At most {DO_RETURN_BATCH_LIMIT} returns can be processed per batch"}), 400
+    
+    results = []
+    for case in cases:
+        payload, status = _do_return_result(case if isinstance(case, dict) else {})
+        results.append({"status": status, "body": payload})
+    return jsonify(results)
+
+def _booking_qr_response(booking_id, max_age):
+    """Render the booking QR PNG as a private, ETag-revalidated response."""
     # For demo purposes, we'll create a mock booking if not found
     # In a real app, you'd fetch this from your database
     booking_data = {
@@ -884,63 +1269,71 @@ Item: {booking_data['item_name']}
 Employee: {booking_data['employee_id']}
 Date: {booking_data['booking_date']}
 Status: {booking_data['status']}
-Generated: {date.today().isoformat()}"""
-    
-    # Generate QR code
-    qr = qrcode.QRCode(
-        version=1,
-        error_correction=qrcode.constants.ERROR_CORRECT_L,
-        box_size=10,
-        border=4,
-    )
-    qr.add_data(qr_content)
-    qr.make(fit=True)
-    
-    # Create image
-    img = qr.make_image(fill_color="black", back_color="white")
+Generated: {_today_iso()}"""
     
-    # Convert to bytes
-    img_buffer = io.BytesIO()
-    img.save(img_buffer, format='PNG')
-    img_buffer.seek(0)
-    
-    # Create response
-    response = make_response(img_buffer.getvalue())
-    response.headers['Content-Type'] = 'image/png'
-    response.headers['Content-Disposition'] = f'inline; filename=booking_{booking_id}_qrcode.png'
+    # Generate QR code image (PNG bytes)
+    png = render_qr_png(qr_content)
     
+    # Stream the PNG; the browser keeps it and revalidates cheaply by ETag
+    response = send_file(
+        io.BytesIO(png),
+        mimetype='image/png',
+        download_name=f'booking_{booking_id}_qrcode.png',
+        max_age=max_age,
+        etag=hashlib.blake2b(png, digest_size=8).hexdigest(),
+        conditional=True
+    )
+    # Booking details are not public, so keep them out of shared caches
+    response.cache_control.public = False
+    response.cache_control.private = True
     return response
 
+@app.route("/qrcode/<int:booking_id>")
+@login_required
+def generate_qrcode(booking_id):
+    """Generate QR code for a specific booking."""
+    return _booking_qr_response(booking_id, max_age=86400)
+
+@app.template_global()
+def signed_qrcode_url(booking_id):
+    """URL for a booking's QR image that works without a login session for SIGNED_QR_MAX_AGE seconds."""
+    return url_for('signed_qrcode', token=_QR_URL_SIGNER.dumps(booking_id))
+
+@app.route("/qrcode/signed/<token>")
+def signed_qrcode(token):
+    """Serve a booking QR code from a signed link, skipping the user loader."""
+    try:
+        booking_id = _QR_URL_SIGNER.loads(token, max_age=SIGNED_QR_MAX_AGE)
+    except SignatureExpired:
+        # A page left open past the expiry falls back to the login-protected route
+        return redirect(url_for('generate_qrcode', booking_id=_QR_URL_SIGNER.loads(token)))
+    except BadSignature:
+        return "QR code link is invalid or has expired.", 403
+    return _booking_qr_response(booking_id, max_age=60)
+
+def _login_qr_png(empid):
+    """PNG bytes and ETag for the login QR code of empid."""
+    png = render_qr_png(f"empid={empid}")
+    return png, hashlib.blake2b(png, digest_size=8).hexdigest()
+
+# Login QR codes for every known employee, rendered once at startup: {str(empid): (png, etag)}
+_LOGIN_QR_PNGS = {str(empid): _login_qr_png(empid) for empid in EMPLOYEE_USERS}
+
 @app.route("/login-qrcode/<empid>")
 def generate_login_qrcode(empid):
     """Generate QR code for login with employee ID."""
-    # Create QR code content for login
-    qr_content = f"empid={empid}"
+    # Known employees are served from the startup cache; anything else is rendered on demand
+    png, etag = _LOGIN_QR_PNGS.get(empid) or _login_qr_png(empid)
     
-    # Generate QR code
-    qr = qrcode.QRCode(
-        version=1,
-        error_correction=qrcode.constants.ERROR_CORRECT_L,
-        box_size=10,
-        border=4,
+    # Stream the PNG; the browser keeps it for a day and revalidates cheaply by ETag
+    return send_file(
+        io.BytesIO(png),
+        mimetype='image/png',
+        download_name=f'login_empid_{empid}_qrcode.png',
+        max_age=86400,
+        etag=etag,
+        conditional=True
     )
-    qr.add_data(qr_content)
-    qr.make(fit=True)
-    
-    # Create image
-    img = qr.make_image(fill_color="black", back_color="white")
-    
-    # Convert to bytes
-    img_buffer = io.BytesIO()
-    img.save(img_buffer, format='PNG')
-    img_buffer.seek(0)
-    
-    # Create response
-    response = make_response(img_buffer.getvalue())
-    response.headers['Content-Type'] = 'image/png'
-    response.headers['Content-Disposition'] = f'inline; filename=login_empid_{empid}_qrcode.png'
-    
-    return response
 
 @app.route("/apex-url-test")
 def apex_url_test():
@@ -950,23 +1343,20 @@ def apex_url_test():
     full_url = f"{BASE_URL}/get_date_data?empid=1"
     
     try:
-        print("=" * 60)
-        print("APEX URL ACCESSIBILITY TEST")
-        print("=" * 60)
+        logger.debug("APEX URL ACCESSIBILITY TEST")
         
         # Test the base URL first
-        print(f"Testing base URL: {base_url}")
+        logger.debug("Testing base URL: %s", base_url)
         
-        import requests
         response = requests.get(base_url, timeout=5)
-        print(f"Base URL Status: {response.status_code}")
+        logger.debug("Base URL Status: %s", response.status_code)
         
         # Test the full path
-        print(f"Testing full URL: {full_url}")
+        logger.debug("Testing full URL: %s", full_url)
         
         response2 = requests.get(full_url, timeout=5)
-        print(f"Full URL Status: {response2.status_code}")
-        print(f"Response Headers: {dict(response2.headers)}")
+        logger.debug("Full URL Status: %s", response2.status_code)
+        logger.debug("Response Headers: %s", response2.headers)
         
         return jsonify({
             "status": "success",
@@ -1003,29 +1393,26 @@ def apex_url_test():
 def apex_connectivity_test():
     """Simple connectivity test without helper functions."""
     try:
-        print("=" * 60)
-        print("APEX CONNECTIVITY TEST")
-        print("=" * 60)
+        logger.debug("APEX CONNECTIVITY TEST")
         
         test_url = f"{BASE_URL}/get_date_data?empid=1"
-        print(f"Testing direct connection to: {test_url}")
+        logger.debug("Testing direct connection to: %s", test_url)
         
-        # Direct request without helper functions
-        import requests
+        # Direct request without helper functions or the pooled session's retries
         response = requests.get(
             test_url,
             headers={"Accept": "application/json"},
             timeout=10  # Shorter timeout for quick test
         )
         
-        print(f"Response Status: {response.status_code}")
-        print(f"Response URL: {response.url}")
-        print(f"Response Headers: {dict(response.headers)}")
+        logger.debug("Response Status: %s", response.status_code)
+        logger.debug("Response URL: %s", response.url)
+        logger.debug("Response Headers: %s", response.headers)
         
         if response.status_code == 200:
             try:
-                data = response.json()
-                print(f"Response Data: {data}")
+                data = orjson.loads(response.content)
+                logger.debug("Response Data: %s", data)
                 return jsonify({
                     "status": "success",
                     "message": "Direct connection successful",
@@ -1034,7 +1421,7 @@ def apex_connectivity_test():
                     "data": data
                 })
             except Exception as json_error:
-                print(f"JSON Parse Error: {json_error}")
+                logger.warning("JSON Parse Error: %s", json_error)
                 return jsonify({
                     "status": "partial_success",
                     "message": "Connection successful but JSON parse failed",
@@ -1053,21 +1440,21 @@ def apex_connectivity_test():
             })
             
     except requests.exceptions.Timeout:
-        print("Direct connection timeout")
+        logger.warning("Direct connection timeout")
         return jsonify({
             "status": "error",
             "message": "Direct connection timeout (10s)",
             "url": test_url
         })
     except requests.exceptions.ConnectionError as e:
-        print(f"Direct connection error: {e}")
+        logger.warning("Direct connection error: %s", e)
         return jsonify({
             "status": "error",
             "message": f"Connection error: {str(e)}",
             "url": test_url
         })
     except Exception as e:
-        print(f"Direct test exception: {e}")
+        logger.warning("Direct test exception: %s", e)
         return jsonify({
             "status": "error",
             "message": f"Unexpected error: {str(e)}",
@@ -1081,24 +1468,21 @@ def apex_mock_test():
     original_mock = MOCK
     
     try:
-        print("=" * 60)
-        print("APEX MOCK TEST")
-        print("=" * 60)
+        logger.debug("APEX MOCK TEST")
         
         # Temporarily enable MOCK mode
         MOCK = True
         
-        print(f"Temporarily enabling MOCK mode: {MOCK}")
+        logger.debug("Temporarily enabling MOCK mode: %s", MOCK)
         
         # Call the _get function with empid=1
         resp = _get("get_date_data", params={"empid": 1})
         
-        print(f"Mock Test Response: {resp}")
+        logger.debug("Mock Test Response: %s", resp)
         
         # Restore original MOCK setting
         MOCK = original_mock
-        print(f"Restored MOCK mode to: {MOCK}")
-        print("=" * 60)
+        logger.debug("Restored MOCK mode to: %s", MOCK)
         
         return jsonify({
             "status": "success",
@@ -1110,7 +1494,7 @@ def apex_mock_test():
     except Exception as e:
         # Restore original MOCK setting in case of error
         MOCK = original_mock
-        print(f"Mock test exception: {e}")
+        logger.warning("Mock test exception: %s", e)
         return jsonify({
             "status": "error",
             "error": f"Mock test failed: {str(e)}",
@@ -1120,17 +1504,12 @@ def apex_mock_test():
 @app.route("/apex-network-test")
 def apex_network_test():
     """Test different network approaches to reach Oracle APEX."""
-    import requests
-    import urllib3
-    
     # Disable SSL warnings for testing
     urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
     
     test_url = f"{BASE_URL}/get_date_data?empid=1"
     
-    print("=" * 60)
-    print("APEX NETWORK DIAGNOSTIC TEST")
-    print("=" * 60)
+    logger.debug("APEX NETWORK DIAGNOSTIC TEST")
     
     tests = [
         {
@@ -1176,42 +1555,42 @@ def apex_network_test():
         }
     ]
     
-    results = []
-    
-    for test in tests:
-        print(f"\nTesting: {test['name']}")
+    def run_probe(test):
+        logger.debug("Testing: %s", test['name'])
         try:
             response = requests.get(test_url, **test['kwargs'])
-            print(f"✅ SUCCESS: Status {response.status_code}")
-            results.append({
+            logger.debug("SUCCESS: Status %s", response.status_code)
+            return {
                 "test": test['name'],
                 "status": "success",
                 "status_code": response.status_code,
                 "response_time": response.elapsed.total_seconds()
-            })
+            }
         except requests.exceptions.Timeout as e:
-            print(f"❌ TIMEOUT: {e}")
-            results.append({
+            logger.warning("TIMEOUT: %s", e)
+            return {
                 "test": test['name'],
                 "status": "timeout",
                 "error": str(e)
-            })
+            }
         except requests.exceptions.ConnectionError as e:
-            print(f"❌ CONNECTION ERROR: {e}")
-            results.append({
+            logger.warning("CONNECTION ERROR: %s", e)
+            return {
                 "test": test['name'],
                 "status": "connection_error",
                 "error": str(e)
-            })
+            }
         except Exception as e:
-            print(f"❌ OTHER ERROR: {e}")
-            results.append({
+            logger.warning("OTHER ERROR: %s", e)
+            return {
                 "test": test['name'],
                 "status": "error",
                 "error": str(e)
-            })
+            }
     
-    print("=" * 60)
+    # The probes are independent and I/O-bound, so run them side by side; map keeps results in test order
+    with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+        results = list(executor.map(run_probe, tests))
     
     return jsonify({
         "status": "completed",
@@ -1223,21 +1602,18 @@ def apex_network_test():
 def apex_test():
     """Test route to debug Oracle APEX connectivity."""
     try:
-        print("=" * 60)
-        print("APEX TEST ROUTE CALLED")
-        print(f"BASE_URL: {BASE_URL}")
-        print(f"MOCK MODE: {MOCK}")
-        print("=" * 60)
+        logger.debug("APEX TEST ROUTE CALLED")
+        logger.debug("BASE_URL: %s", BASE_URL)
+        logger.debug("MOCK MODE: %s", MOCK)
         
         # Test basic connectivity first
         test_url = f"{BASE_URL}/get_date_data?empid=1"
-        print(f"Testing URL: {test_url}")
+        logger.debug("Testing URL: %s", test_url)
         
         # Call the _get function with empid=1
         resp = _get("get_date_data", params={"empid": 1})
         
-        print(f"APEX Test Response: {resp}")
-        print("=" * 60)
+        logger.debug("APEX Test Response: %s", resp)
         
         # Check if there was an error
         if isinstance(resp, dict) and resp.get("error"):
@@ -1260,7 +1636,7 @@ def apex_test():
             })
             
     except Exception as e:
-        print(f"APEX Test Exception: {e}")
+        logger.warning("APEX Test Exception: %s", e)
         return jsonify({
             "status": "error",
             "error": f"Internal error: {str(e)}",
@@ -1269,6 +1645,15 @@ def apex_test():
             "mock_mode": MOCK
         })
 
+def _qr_return_error(error_msg):
+    """JSON error response for a failed APEX call during a QR return, with a status code matching the failure."""
+    kind = _apex_error_kind(error_msg)
+    if kind == "timeout":
+        return jsonify({"status": "error", "message": f"Oracle APEX service timeout: {error_msg}"}), 504
+    if kind == "connection":
+        return jsonify({"status": "error", "message": f"Unable to connect to Oracle APEX service: {error_msg}"}), 500
+    return jsonify({"status": "error", "message": f"Oracle APEX service error: {error_msg}"}), 500
+
 @app.route("/qr-return", methods=["POST"])
 @login_required
 def qr_return():
@@ -1284,56 +1669,47 @@ def qr_return():
         if not bookid or not empid:
             return jsonify({"status": "error", "message": "Booking ID and Employee ID are required"}), 400
         
+        # Normalise ids once so the booking scan compares ints instead of building strings per row
+        try:
+            bookid_int = int(bookid)
+            empid_int = int(empid)
+        except (TypeError, ValueError):
+            return jsonify({"status": "error", "message": "Booking ID and Employee ID must be numeric"}), 400
+        
         # First, get the booking details to verify the employee ID
-        booking_resp = _get("inventory_booking/get_date_data", params={"empid": empid})
+        booking_resp = _get("inventory_booking/get_date_data", params={"empid": empid_int})
         
         if isinstance(booking_resp, dict) and booking_resp.get("error"):
-            error_msg = booking_resp.get("error")
-            # Determine appropriate status code based on error type
-            if "timeout" in error_msg.lower() or "took too long" in error_msg.lower():
-                return jsonify({"status": "error", "message": f"Oracle APEX service timeout: {error_msg}"}), 504
-            elif "unable to reach" in error_msg.lower() or "connection" in error_msg.lower():
-                return jsonify({"status": "error", "message": f"Unable to connect to Oracle APEX service: {error_msg}"}), 500
-            else:
-                return jsonify({"status": "error", "message": f"Oracle APEX service error: {error_msg}"}), 500
-        
-        # Check if the booking exists and belongs to this employee
-        bookings = booking_resp.get("items", [])
-        target_booking = None
+            return _qr_return_error(booking_resp.get("error"))
         
-        for booking in bookings:
-            if str(booking.get("t_booking_id")) == str(bookid):
-                target_booking = booking
-                break
+        # Check if the booking exists and belongs to this employee; rows whose id doesn't parse are skipped
+        target_booking = next(
+            (b for b in booking_resp.get("items", [])
+             if _safe_int(str(b.get("t_booking_id"))) == bookid_int),
+            None
+        )
         
         if not target_booking:
             return jsonify({"status": "error", "message": "Booking not found for this employee"}), 404
         
         # Verify the employee ID matches
-        if str(target_booking.get("t_employee_id")) != str(empid):
+        if _safe_int(str(target_booking.get("t_employee_id"))) != empid_int:
             return jsonify({"status": "error", "message": "QR code does not match booking employee"}), 403
         
         # Check if already returned
-        if target_booking.get("t_return_date") != "Not Returned":
+        if target_booking.get("t_return_date") != NOT_RETURNED:
             return jsonify({"status": "error", "message": "Equipment already returned"}), 400
         
         # Proceed with the return
         return_resp = _post("inventory_booking/postdata", params={
-            "returndate": date.today().isoformat(),
-            "bookid": bookid,
-            "empid": empid
+            "returndate": _today_iso(),
+            "bookid": bookid_int,
+            "empid": empid_int
         })
         
         if isinstance(return_resp, dict):
             if return_resp.get("error"):
-                error_msg = return_resp.get("error")
-                # Determine appropriate status code based on error type
-                if "timeout" in error_msg.lower() or "took too long" in error_msg.lower():
-                    return jsonify({"status": "error", "message": f"Oracle APEX service timeout: {error_msg}"}), 504
-                elif "unable to reach" in error_msg.lower() or "connection" in error_msg.lower():
-                    return jsonify({"status": "error", "message": f"Unable to connect to Oracle APEX service: {error_msg}"}), 500
-                else:
-                    return jsonify({"status": "error", "message": f"Oracle APEX service error: {error_msg}"}), 500
+                return _qr_return_error(return_resp.get("error"))
             elif return_resp.get("updated_rows") == 1 or return_resp.get("status") == "success":
                 return jsonify({
                     "status": "success", 
@@ -1364,7 +1740,7 @@ def employees():
             employees_list = []
         else:
             employees_list = resp.get("items", [])
-        return render_template("employees.html", employees=employees_list, MOCK_MODE=MOCK)
+        return conditional_response(employees_list, lambda: render_template("employees.html", employees=employees_list, MOCK_MODE=MOCK))
     except Exception as e:
         flash(f"Error loading employees: {str(e)}", "danger")
         return render_template("employees.html", employees=[], MOCK_MODE=MOCK)
@@ -1376,9 +1752,11 @@ def employees_add():
     if request.method == "POST":
         try:
             # Get form data
-            fname = request.form.get("t_emp_fname", "").strip()
-            lname = request.form.get("t_emp_lname", "").strip()
-            dept = request.form.get("t_emp_dept", "").strip()
+            try:
+                fname, lname, dept = _request_fields("t_emp_fname", "t_emp_lname", "t_emp_dept")
+            except ValueError as e:
+                flash(str(e), "danger")
+                return render_template("employees_add.html", MOCK_MODE=MOCK)
             
             # Validate required fields
             if not fname or not lname or not dept:
@@ -1407,23 +1785,26 @@ def employees_add():
 @admin_required
 def employees_edit(empid):
     """Edit an employee."""
-    try:
-        empid_int = int(empid)
-    except ValueError:
+    empid_int = _safe_int(empid)
+    if empid_int is None:
         flash("Invalid employee ID.", "danger")
         return redirect(url_for("employees"))
     
     if request.method == "POST":
         try:
             # Get form data
-            fname = request.form.get("t_emp_fname", "").strip()
-            lname = request.form.get("t_emp_lname", "").strip()
-            dept = request.form.get("t_emp_dept", "").strip()
+            try:
+                fname, lname, dept = _request_fields("t_emp_fname", "t_emp_lname", "t_emp_dept")
+            except ValueError as e:
+                flash(str(e), "danger")
+                return redirect(url_for("employees_edit", empid=empid_int))
             
             # Validate required fields
             if not fname or not lname or not dept:
                 flash("All fields are required.", "danger")
-                return redirect(url_for("employees_edit", empid=empid))
+                # Re-render with what was submitted rather than redirecting into another employees/get
+                employee = {"t_empid": empid_int, "t_emp_fname": fname, "t_emp_lname": lname, "t_emp_dept": dept}
+                return render_template("employees_edit.html", employee=employee, MOCK_MODE=MOCK)
             
             # Update employee
             resp = _put("employees/update", params={
@@ -1444,14 +1825,11 @@ def employees_edit(empid):
     else:
         # GET request - fetch employee data
         try:
-            resp = _get("employees/get", params={"empid": empid_int})
-            if isinstance(resp, dict) and resp.get("error"):
-                flash(f"Unable to fetch employee: {resp['error']}", "danger")
+            employee, error = _get_one("employees/get", "t_empid", empid_int, empid=empid_int)
+            if error:
+                flash(f"Unable to fetch employee: {error}", "danger")
                 return redirect(url_for("employees"))
             
-            employees_list = resp.get("items", [])
-            employee = employees_list[0] if employees_list else None
-            
             if not employee:
                 flash("Employee not found.", "danger")
                 return redirect(url_for("employees"))
@@ -1476,7 +1854,7 @@ def inventory():
             inventory_list = []
         else:
             inventory_list = resp.get("items", [])
-        return render_template("inventory.html", inventory=inventory_list, MOCK_MODE=MOCK)
+        return conditional_response(inventory_list, lambda: render_template("inventory.html", inventory=inventory_list, MOCK_MODE=MOCK))
     except Exception as e:
         flash(f"Error loading inventory: {str(e)}", "danger")
         return render_template("inventory.html", inventory=[], MOCK_MODE=MOCK)
@@ -1488,15 +1866,13 @@ def inventory_add():
     if request.method == "POST":
         try:
             # Handle both form data and JSON requests
-            if request.is_json:
-                data = request.get_json()
-                name = data.get("t_item_name", "").strip()
-                category = data.get("t_item_category", "").strip()
-                quantity = data.get("t_quantity", "").strip()
-            else:
-                name = request.form.get("t_item_name", "").strip()
-                category = request.form.get("t_item_category", "").strip()
-                quantity = request.form.get("t_quantity", "").strip()
+            try:
+                name, category, quantity = _request_fields("t_item_name", "t_item_category", "t_quantity")
+            except ValueError as e:
+                if request.is_json:
+                    return jsonify({"error": str(e)}), 400
+                flash(str(e), "danger")
+                return render_template("inventory_add.html", MOCK_MODE=MOCK)
             
             # Validate required fields
             if not name or not category or not quantity:
@@ -1543,13 +1919,17 @@ def inventory_add():
     
     return render_template("inventory_add.html", MOCK_MODE=MOCK)
 
+def _inventory_edit_form(itemid, name, category, quantity):
+    """Re-render the edit form with the submitted values, so a failed validation costs no inventory/get."""
+    item = {"t_item_id": itemid, "t_item_name": name, "t_item_category": category, "t_quantity": quantity}
+    return render_template("inventory_edit.html", item=item, MOCK_MODE=MOCK)
+
 @app.route("/inventory/edit/<itemid>", methods=["GET", "POST"])
 @admin_required
 def inventory_edit(itemid):
     """Edit an inventory item."""
-    try:
-        itemid_int = int(itemid)
-    except ValueError:
+    itemid_int = _safe_int(itemid)
+    if itemid_int is None:
         error_msg = "Invalid item ID."
         if request.is_json:
             return jsonify({"error": error_msg}), 400
@@ -1559,15 +1939,13 @@ def inventory_edit(itemid):
     if request.method == "POST":
         try:
             # Handle both form data and JSON requests
-            if request.is_json:
-                data = request.get_json()
-                name = data.get("t_item_name", "").strip()
-                category = data.get("t_item_category", "").strip()
-                quantity = data.get("t_quantity", "").strip()
-            else:
-                name = request.form.get("t_item_name", "").strip()
-                category = request.form.get("t_item_category", "").strip()
-                quantity = request.form.get("t_quantity", "").strip()
+            try:
+                name, category, quantity = _request_fields("t_item_name", "t_item_category", "t_quantity")
+            except ValueError as e:
+                if request.is_json:
+                    return jsonify({"error": str(e)}), 400
+                flash(str(e), "danger")
+                return redirect(url_for("inventory_edit", itemid=itemid_int))
             
             # Validate required fields
             if not name or not category or not quantity:
@@ -1575,7 +1953,7 @@ def inventory_edit(itemid):
                 if request.is_json:
                     return jsonify({"error": error_msg}), 400
                 flash(error_msg, "danger")
-                return redirect(url_for("inventory_edit", itemid=itemid))
+                return _inventory_edit_form(itemid_int, name, category, quantity)
             
             # Validate quantity is numeric
             try:
@@ -1585,7 +1963,7 @@ def inventory_edit(itemid):
                 if request.is_json:
                     return jsonify({"error": error_msg}), 400
                 flash(error_msg, "danger")
-                return redirect(url_for("inventory_edit", itemid=itemid))
+                return _inventory_edit_form(itemid_int, name, category, quantity)
             
             # Update inventory item
             resp = _put("inventory/update", params={
@@ -1615,14 +1993,11 @@ def inventory_edit(itemid):
     else:
         # GET request - fetch inventory item data
         try:
-            resp = _get("inventory/get", params={"itemid": itemid_int})
-            if isinstance(resp, dict) and resp.get("error"):
-                flash(f"Unable to fetch inventory item: {resp['error']}", "danger")
+            item, error = _get_one("inventory/get", "t_item_id", itemid_int, itemid=itemid_int)
+            if error:
+                flash(f"Unable to fetch inventory item: {error}", "danger")
                 return redirect(url_for("inventory"))
             
-            inventory_list = resp.get("items", [])
-            item = inventory_list[0] if inventory_list else None
-            
             if not item:
                 flash("Inventory item not found.", "danger")
                 return redirect(url_for("inventory"))
@@ -1650,28 +2025,26 @@ def usage():
         # Build params for API call
         params = {}
         if empid:
-            try:
-                params["empid"] = int(empid)
-            except ValueError:
+            empid_int = _safe_int(empid)
+            if empid_int is None:
                 flash("Employee ID must be a number.", "warning")
+            else:
+                params["empid"] = empid_int
         if item_id:
-            try:
-                params["t_item_id"] = int(item_id)
-            except ValueError:
+            item_id_int = _safe_int(item_id)
+            if item_id_int is None:
                 flash("Item ID must be a number.", "warning")
+            else:
+                params["t_item_id"] = item_id_int
         if start_date:
-            try:
-                from datetime import datetime
-                datetime.strptime(start_date, '%Y-%m-%d')
+            if _is_iso_date(start_date):
                 params["start_date"] = start_date
-            except ValueError:
+            else:
                 flash("Start date must be in YYYY-MM-DD format.", "warning")
         if end_date:
-            try:
-                from datetime import datetime
-                datetime.strptime(end_date, '%Y-%m-%d')
+            if _is_iso_date(end_date):
                 params["end_date"] = end_date
-            except ValueError:
+            else:
                 flash("End date must be in YYYY-MM-DD format.", "warning")
         
         # Fetch usage data
@@ -1691,10 +2064,30 @@ def usage():
         return render_template("usage.html", usage=[], filters={}, MOCK_MODE=MOCK)
 
 # Bookings Management Routes
+# (employee rows, {id: row}) for the last roster seen; a GET-cache hit hands back the same rows, so the index is reused
+_employee_index = ((), {})
+
+def _employee_by_id(empid):
+    """The roster row for empid (matched on t_empid or empid), via the cached employees/get and an id index."""
+    global _employee_index
+    employees = _get_items("employees/get")
+    rows, index = _employee_index
+    if rows is not employees:
+        index = {}
+        for emp in employees:
+            for key in ("t_empid", "empid"):
+                if emp.get(key) is not None:
+                    index.setdefault(emp[key], emp)
+        _employee_index = (employees, index)
+    return index.get(empid)
+
 @app.route("/bookings-management", methods=["GET"])
 @admin_required
 def bookings_management():
     """List all bookings with optional filters and employee dropdown."""
+    # AJAX/JSON callers only get the booking rows back, so they don't need the employee dropdown
+    wants_json = (request.headers.get('X-Requested-With') == 'XMLHttpRequest'
+                  or request.accept_mimetypes.best == 'application/json')
     try:
         # Get filter parameters
         empid = request.args.get('empid', 'all').strip()
@@ -1702,99 +2095,96 @@ def bookings_management():
         end_date = request.args.get('end_date', '').strip()
         status_filter = request.args.get('status', 'all').strip()
         
-        # Get employees list for dropdown with fallback
-        employees_resp = _get("employees/get")
-        employees_list = []
-        if isinstance(employees_resp, dict) and not employees_resp.get("error"):
-            employees_list = employees_resp.get("items", [])
-        elif isinstance(employees_resp, dict) and employees_resp.get("error"):
-            # Fallback to mock employees data
-            print(f"Oracle APEX employees failed: {employees_resp['error']}, using mock data")
-            employees_list = mock_get("employees/get", None).get("items", [])
+        # Employees (for the dropdown) don't depend on the filters, so fetch them while the bookings query runs
+        employees_future = None if wants_json else _submit_get("employees/get")
         
         # Build API parameters
         params = {}
-        print(f"[DEBUG] empid value: '{empid}' (type: {type(empid)})")
+        logger.debug("empid value: %r (type: %s)", empid, type(empid))
         if empid and empid.strip() and empid != 'all' and empid != 'All Employees':
-            try:
-                params['empid'] = int(empid)
-                print(f"[DEBUG] Added empid to params: {params}")
-            except ValueError:
+            empid_int = _safe_int(empid)
+            if empid_int is None:
                 flash("Invalid employee ID format", "danger")
                 empid = ''
+            else:
+                params['empid'] = empid_int
+                logger.debug("Added empid to params: %s", params)
         else:
-            print(f"[DEBUG] Not adding empid to params, using all employees")
+            logger.debug("Not adding empid to params, using all employees")
         
         if start_date:
-            try:
-                # Validate date format
-                datetime.strptime(start_date, '%Y-%m-%d')
+            # Validate date format
+            if _is_iso_date(start_date):
                 params['start_date'] = start_date
-            except ValueError:
+            else:
                 flash("Invalid start date format (use YYYY-MM-DD)", "danger")
                 start_date = ''
         
         if end_date:
-            try:
-                # Validate date format
-                datetime.strptime(end_date, '%Y-%m-%d')
+            # Validate date format
+            if _is_iso_date(end_date):
                 params['end_date'] = end_date
-            except ValueError:
+            else:
                 flash("Invalid end date format (use YYYY-MM-DD)", "danger")
                 end_date = ''
         
         # Get bookings data with fallback to mock data
-        print(f"[DEBUG] MOCK mode: {MOCK}")
-        print(f"[DEBUG] Filter params - empid: '{empid}', status: '{status_filter}', start_date: '{start_date}', end_date: '{end_date}'")
-        print(f"[DEBUG] Calling _get with params: {params}")
+        logger.debug("MOCK mode: %s", MOCK)
+        logger.debug("Filter params - empid: %r, status: %r, start_date: %r, end_date: %r", empid, status_filter, start_date, end_date)
+        logger.debug("Calling _get with params: %s", params)
         resp = _get("inventory_booking/get_date_data", params=params if params else {})
-        print(f"[DEBUG] Response type: {type(resp)}")
-        print(f"[DEBUG] Response content: {resp}")
+        logger.debug("Response type: %s", type(resp))
+        logger.debug("Response content: %s", resp)
         
-        if isinstance(resp, dict) and (resp.get("error") or len(resp.get("items", [])) == 0):
-            # If Oracle APEX fails or returns no data, fall back to mock data
-            if resp.get("error"):
-                print(f"Oracle APEX failed: {resp['error']}, falling back to mock data")
-                flash(f"Oracle APEX connection failed, showing sample data: {resp['error']}", "warning")
-            else:
-                print(f"Oracle APEX returned no data (0 items), falling back to mock data")
-                flash("No booking data found in Oracle APEX, showing sample data", "info")
-            # Use mock data directly
+        if isinstance(resp, dict) and resp.get("error"):
+            # If Oracle APEX fails, fall back to mock data. An empty result is a real answer
+            # (e.g. no bookings match the filters) and is shown as such
+            logger.warning("Oracle APEX failed: %s, falling back to mock data", resp['error'])
+            flash(f"Oracle APEX connection failed, showing sample data: {resp['error']}", "warning")
             resp = mock_get("inventory_booking/get_date_data", params if params else {})
-            print(f"[DEBUG] Mock response: {resp}")
         
         bookings_list = resp.get("items", [])
-        print(f"[DEBUG] Bookings list length: {len(bookings_list)}")
-        
-        # Ensure employee names are populated
-        employee_dict = {emp.get('t_empid'): f"{emp.get('t_emp_fname', '')} {emp.get('t_emp_lname', '')}".strip() 
-                        for emp in employees_list}
+        logger.debug("Bookings list length: %s", len(bookings_list))
         
-        for booking in bookings_list:
-            emp_id = booking.get('t_employee_id')
-            if emp_id and not booking.get('employee_name'):
-                booking['employee_name'] = employee_dict.get(emp_id, f'Employee {emp_id}')
+        # Get employees list for dropdown with fallback
+        employees_list = None if employees_future is None else _items_or_mock("employees/get", employees_future.result())
         
         # Apply status filter on the client side if needed
         if status_filter and status_filter != 'all' and status_filter.strip():
             if status_filter == 'out':
-                bookings_list = [b for b in bookings_list if b.get('t_return_date') == 'Not Returned']
+                bookings_list = [b for b in bookings_list if b.get('t_return_date') == NOT_RETURNED]
             elif status_filter == 'returned':
-                bookings_list = [b for b in bookings_list if b.get('t_return_date') != 'Not Returned']
+                bookings_list = [b for b in bookings_list if b.get('t_return_date') != NOT_RETURNED]
             elif status_filter == 'overdue':
-                # Filter for overdue items (booking date + 7 days < today and not returned)
-                from datetime import timedelta
-                today = date.today()
-                overdue_bookings = []
-                for booking in bookings_list:
-                    if booking.get('t_return_date') == 'Not Returned':
-                        try:
-                            booking_date = datetime.strptime(booking.get('t_booking_date', ''), '%Y-%m-%d').date()
-                            if booking_date + timedelta(days=7) < today:
-                                overdue_bookings.append(booking)
-                        except:
-                            pass
-                bookings_list = overdue_bookings
+                # Filter for overdue items (booking date + 7 days < today and not returned).
+                # YYYY-MM-DD strings sort chronologically, so compare them directly instead of parsing each row
+                overdue_cutoff = (date.today() - timedelta(days=7)).isoformat()
+                bookings_list = [
+                    b for b in bookings_list
+                    if b.get('t_return_date') == NOT_RETURNED
+                    and isinstance(b.get('t_booking_date'), str) and len(b['t_booking_date']) == 10
+                    and b['t_booking_date'] < overdue_cutoff
+                ]
+        
+        # Ensure employee names are populated on the rows that survived the filter;
+        # the id -> name map is only built if some row actually lacks a name.
+        # The rows may be shared with the GET cache, so named rows are copies
+        employee_dict = None
+        named_bookings = []
+        for booking in bookings_list:
+            emp_id = booking.get('t_employee_id')
+            if emp_id and not booking.get('employee_name'):
+                if employee_dict is None:
+                    if employees_list is None:
+                        employees_list = _get_items("employees/get")
+                    employee_dict = {emp.get('t_empid'): " ".join((emp.get('t_emp_fname', ''), emp.get('t_emp_lname', ''))).strip()
+                                     for emp in employees_list}
+                booking = dict(booking, employee_name=employee_dict.get(emp_id, f'Employee {emp_id}'))
+            named_bookings.append(booking)
+        bookings_list = named_bookings
+        
+        if wants_json:
+            return jsonify({"bookings": bookings_list})
         
         return render_template("bookings.html", 
                              bookings=bookings_list, 
@@ -1805,104 +2195,96 @@ def bookings_management():
                                  'end_date': end_date,
                                  'status': status_filter
                              },
-                             today=date.today().strftime('%Y-%m-%d'),
+                             today=_today_iso(),
                              MOCK_MODE=MOCK)
     except Exception as e:
+        if wants_json:
+            return jsonify({"error": f"Error loading bookings: {str(e)}"}), 500
         flash(f"Error loading bookings: {str(e)}", "danger")
         return render_template("bookings.html", 
                              bookings=[], 
                              employees=[],
                              filters={},
-                             today=date.today().strftime('%Y-%m-%d'),
+                             today=_today_iso(),
                              MOCK_MODE=MOCK)
 
+def _return_and_restock(bookid, empid, returndate):
+    """Return a booking and bump its item's quantity with separate APEX calls; gives back the return POST response."""
+    # First, get the booking details to find the inventory item
+    # ORDS may ignore the bookid filter, so pick the matching row rather than trusting items[0]
+    booking = _find_row(_get("inventory_booking/get_date_data", params={"bookid": bookid}), "t_booking_id", bookid)
+    
+    # If we couldn't find the booking in APEX, try to get it from mock data
+    if not (booking and booking.get("t_inventory_id")):
+        booking = _find_row(mock_get("inventory_booking/get_date_data", {"bookid": bookid}), "t_booking_id", bookid)
+    inventory_id = booking.get("t_inventory_id") if booking else None
+    
+    logger.debug("Found inventory_id: %s for booking %s", inventory_id, bookid)
+    
+    # Call the return API
+    resp = _post("inventory_booking/postdata", params={
+        "bookid": bookid,
+        "empid": empid,
+        "returndate": returndate
+    })
+    
+    # If return was successful and we have an inventory ID, update inventory quantity
+    if inventory_id and (not isinstance(resp, dict) or not resp.get("error")):
+        try:
+            # Get current inventory item details once the return has gone through; the quantity
+            # feeds the update below, so read it fresh rather than from the GET cache
+            item = _find_row(_get("inventory/get", params={"itemid": inventory_id}, refresh=True), "t_item_id", inventory_id)
+            
+            # If we couldn't find in APEX, try mock data
+            if not item or (not int(item.get("t_item_quantity", 0)) and not item.get("t_item_name", "")):
+                item = _find_row(mock_get("inventory/get", {"itemid": inventory_id}), "t_item_id", inventory_id) or item or {}
+            current_quantity = int(item.get("t_item_quantity", 0))
+            item_name = item.get("t_item_name", "")
+            item_category = item.get("t_item_category", "")
+            
+            # Increase quantity by 1
+            new_quantity = current_quantity + 1
+            logger.debug("Updating inventory %s: %s -> %s", inventory_id, current_quantity, new_quantity)
+            
+            # Update inventory quantity (_put drops the cached inventory/ reads)
+            inventory_update_resp = _put("inventory/update", params={
+                "t_item_id": inventory_id,
+                "t_item_name": item_name,
+                "t_item_category": item_category,
+                "t_item_quantity": new_quantity
+            })
+            
+            logger.debug("Inventory update response: %s", inventory_update_resp)
+            
+        except Exception as e:
+            logger.warning("Error updating inventory: %s", e)
+            # Don't fail the return if inventory update fails
+    
+    return resp
+
 @app.route("/bookings/return/<int:bookid>/<int:empid>", methods=["POST"])
 @login_required
 def booking_return(bookid, empid):
     """Mark a booking as returned and update inventory quantity."""
     try:
         # Use today's date as return date
-        today = datetime.now().strftime('%Y-%m-%d')
-        
-        # First, get the booking details to find the inventory item
-        booking_resp = _get("inventory_booking/get_date_data", params={"bookid": bookid})
-        inventory_id = None
-        
-        if isinstance(booking_resp, dict) and booking_resp.get("items"):
-            # Find the specific booking
-            for booking in booking_resp["items"]:
-                if booking.get("t_booking_id") == bookid:
-                    inventory_id = booking.get("t_inventory_id")
-                    break
-        
-        # If we couldn't find the booking in APEX, try to get it from mock data
-        if not inventory_id:
-            # Get mock booking data to find inventory ID
-            mock_booking_resp = mock_get("inventory_booking/get_date_data", {"bookid": bookid})
-            if isinstance(mock_booking_resp, dict) and mock_booking_resp.get("items"):
-                for booking in mock_booking_resp["items"]:
-                    if booking.get("t_booking_id") == bookid:
-                        inventory_id = booking.get("t_inventory_id")
-                        break
-        
-        print(f"[DEBUG] Found inventory_id: {inventory_id} for booking {bookid}")
-        
-        # Call the return API
-        resp = _post("inventory_booking/postdata", params={
-            "bookid": bookid,
-            "empid": empid,
-            "returndate": today
-        })
-        
-        # If return was successful and we have an inventory ID, update inventory quantity
-        if inventory_id and (not isinstance(resp, dict) or not resp.get("error")):
-            try:
-                # Get current inventory item details
-                inventory_resp = _get("inventory/get", params={"itemid": inventory_id})
-                current_quantity = 0
-                item_name = ""
-                item_category = ""
-                
-                if isinstance(inventory_resp, dict) and inventory_resp.get("items"):
-                    for item in inventory_resp["items"]:
-                        if item.get("t_item_id") == inventory_id:
-                            current_quantity = int(item.get("t_item_quantity", 0))
-                            item_name = item.get("t_item_name", "")
-                            item_category = item.get("t_item_category", "")
-                            break
-                
-                # If we couldn't find in APEX, try mock data
-                if current_quantity == 0 and not item_name:
-                    mock_inventory_resp = mock_get("inventory/get", {"itemid": inventory_id})
-                    if isinstance(mock_inventory_resp, dict) and mock_inventory_resp.get("items"):
-                        for item in mock_inventory_resp["items"]:
-                            if item.get("t_item_id") == inventory_id:
-                                current_quantity = int(item.get("t_item_quantity", 0))
-                                item_name = item.get("t_item_name", "")
-                                item_category = item.get("t_item_category", "")
-                                break
-                
-                # Increase quantity by 1
-                new_quantity = current_quantity + 1
-                print(f"[DEBUG] Updating inventory {inventory_id}: {current_quantity} -> {new_quantity}")
-                
-                # Update inventory quantity
-                inventory_update_resp = _put("inventory/update", params={
-                    "t_item_id": inventory_id,
-                    "t_item_name": item_name,
-                    "t_item_category": item_category,
-                    "t_item_quantity": new_quantity
-                })
-                
-                print(f"[DEBUG] Inventory update response: {inventory_update_resp}")
-                
-            except Exception as e:
-                print(f"[DEBUG] Error updating inventory: {e}")
-                # Don't fail the return if inventory update fails
+        today = _today_iso()
+        
+        if APEX_RETURN_AND_RESTOCK and not MOCK:
+            # One server-side call marks the booking returned and restocks its item in the same transaction
+            resp = _post("inventory_booking/return_and_restock", params={
+                "bookid": bookid,
+                "empid": empid,
+                "returndate": today
+            })
+            # The restock changes inventory too, which _post's own invalidation doesn't cover
+            _invalidate_cache("inventory/get")
+        else:
+            resp = _return_and_restock(bookid, empid, today)
         
         # Debug logging
-        print(f"[DEBUG] Return API response: {resp}")
-        print(f"[DEBUG] Response type: {type(resp)}")
+        logger.debug("Return API response: %s", resp)
+        logger.debug("Response type: %s", type(resp))
         
         # Check if this is an AJAX request
         if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
@@ -1914,64 +2296,29 @@ def booking_return(bookid, empid):
                     "type": "error"
                 }), 400
             
-            # Check for explicit success indicators
-            elif isinstance(resp, dict) and resp.get("updated_rows") == 1:
-                # Get updated dashboard data
-                dashboard_data = get_dashboard_data()
+            updated_rows = resp.get("updated_rows") if isinstance(resp, dict) else None
+            # updated_rows == 0 means nothing changed: the booking was already returned,
+            # unless APEX reports status 'no_change' for a return that did complete
+            if updated_rows == 0 and resp.get("status") != "no_change":
                 return jsonify({
-                    "success": True,
-                    "message": "Booking marked as returned successfully!",
-                    "type": "success",
-                    "dashboard_data": {
-                        "total_items": dashboard_data.get("total_items", 0),
-                        "currently_issued": dashboard_data.get("currently_issued", 0),
-                        "total_employees": dashboard_data.get("total_employees", 0),
-                        "recent_bookings": dashboard_data.get("recent_bookings", 0),
-                        "recent_activity": dashboard_data.get("recent_activity", [])[:5]  # Last 5 activities
-                    }
-                })
-            elif isinstance(resp, dict) and resp.get("updated_rows") == 0:
-                # Check if this is actually a successful return with status 'no_change'
-                # This might mean the item was already returned or the operation completed
-                if resp.get("status") == "no_change":
-                    # Treat as success - the operation completed even if no rows were updated
-                    dashboard_data = get_dashboard_data()
-                    return jsonify({
-                        "success": True,
-                        "message": "Booking return processed successfully!",
-                        "type": "success",
-                        "dashboard_data": {
-                            "total_items": dashboard_data.get("total_items", 0),
-                            "currently_issued": dashboard_data.get("currently_issued", 0),
-                            "total_employees": dashboard_data.get("total_employees", 0),
-                            "recent_bookings": dashboard_data.get("recent_bookings", 0),
-                            "recent_activity": dashboard_data.get("recent_activity", [])[:5]  # Last 5 activities
-                        }
-                    })
-                else:
-                    return jsonify({
-                        "success": False,
-                        "message": "This booking was already returned.",
-                        "type": "info"
-                    }), 400
+                    "success": False,
+                    "message": "This booking was already returned.",
+                    "type": "info"
+                }), 400
             
-            # If we get here, assume success (API returned 200 and no explicit error)
-            # This handles cases where Oracle APEX doesn't return updated_rows field
+            if updated_rows == 1:
+                message = "Booking marked as returned successfully!"
             else:
-                print(f"[DEBUG] Assuming success - no explicit error found in response")
-                dashboard_data = get_dashboard_data()
-                return jsonify({
-                    "success": True,
-                    "message": "Booking return processed successfully!",
-                    "type": "success",
-                    "dashboard_data": {
-                        "total_items": dashboard_data.get("total_items", 0),
-                        "currently_issued": dashboard_data.get("currently_issued", 0),
-                        "total_employees": dashboard_data.get("total_employees", 0),
-                        "recent_bookings": dashboard_data.get("recent_bookings", 0),
-                        "recent_activity": dashboard_data.get("recent_activity", [])[:5]  # Last 5 activities
-                    }
-                })
+                # No updated_rows field (or 'no_change'): APEX returned 200 with no explicit error, so assume success
+                logger.debug("Assuming success - no explicit error found in response")
+                message = "Booking return processed successfully!"
+            # One success response, carrying the updated dashboard data
+            return jsonify({
+                "success": True,
+                "message": message,
+                "type": "success",
+                "dashboard_data": _dashboard_payload(5)
+            })
         else:
             # Handle non-AJAX requests (redirect)
             if isinstance(resp, dict) and resp.get("error"):
@@ -2005,24 +2352,27 @@ def booking_return(bookid, empid):
 def api_dashboard_data():
     """API endpoint to get current dashboard data."""
     try:
-        dashboard_data = get_dashboard_data()
-        return jsonify({
+        data = _dashboard_payload(10, low_stock_alerts=True)
+        return conditional_response(data, lambda: jsonify({
             "success": True,
-            "data": {
-                "total_items": dashboard_data.get("total_items", 0),
-                "currently_issued": dashboard_data.get("currently_issued", 0),
-                "total_employees": dashboard_data.get("total_employees", 0),
-                "recent_bookings": dashboard_data.get("recent_bookings", 0),
-                "recent_activity": dashboard_data.get("recent_activity", [])[:10],  # Last 10 activities
-                "low_stock_alerts": dashboard_data.get("low_stock_alerts", [])
-            }
-        })
+            "data": data
+        }))
     except Exception as e:
         return jsonify({
             "success": False,
             "error": str(e)
         }), 500
 
+@app.route("/admin/cache/clear", methods=["POST"])
+@admin_required
+def admin_cache_clear():
+    """Drop the in-process APEX GET cache so the next page load fetches fresh data."""
+    _clear_cache()
+    if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+        return jsonify({"success": True, "message": "APEX cache cleared."})
+    flash("Cached APEX data cleared.", "success")
+    return redirect(url_for("index"))
+
 # Debug route to test inventory API
 @app.route("/debug/inventory")
 @login_required
@@ -2048,8 +2398,10 @@ def debug_inventory():
 def debug_bookings():
     """Debug route to see raw bookings API response."""
     try:
+        # The two fetches are independent, so overlap them
+        employees_future = _submit_get("employees/get")
         resp = _get("inventory_booking/get_date_data")
-        employees_resp = _get("employees/get")
+        employees_resp = employees_future.result()
         
         return jsonify({
             "status": "success",
@@ -2073,37 +2425,54 @@ def debug_bookings():
 @login_required
 def test_apex():
     """Test Oracle APEX connection directly."""
+    # Test the exact URL that should work
+    test_url = "https://oracleapex.com/ords/ifs325_techinnovators/inventory_booking/get_date_data?empid=1"
     try:
-        import requests
-        
-        # Test the exact URL that should work
-        test_url = "https://oracleapex.com/ords/ifs325_techinnovators/inventory_booking/get_date_data?empid=1"
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-            "Accept": "application/json"
-        }
-        
-        print(f"Testing direct connection to: {test_url}")
-        response = requests.get(test_url, headers=headers, timeout=30)
+        logger.debug("Testing direct connection to: %s", test_url)
+        # Bypass the pooled session so its retries don't mask a failing or slow connection
+        response = requests.get(test_url, headers=dict(_APEX_HEADERS), timeout=_APEX_TIMEOUT)
         
         return jsonify({
             "status": "success",
             "url_tested": test_url,
             "status_code": response.status_code,
             "response_headers": dict(response.headers),
-            "response_data": response.json() if response.status_code == 200 else response.text[:500]
+            "response_data": orjson.loads(response.content) if response.status_code == 200 else response.text[:500]
         })
         
     except Exception as e:
         return jsonify({
             "status": "error",
             "error": str(e),
-            "url_tested": test_url if 'test_url' in locals() else "Not set"
+            "url_tested": test_url
         }), 500
 
 # ===== EMPLOYEE-ONLY ROUTES =====
 # These routes are restricted to employees only and include strict user isolation
 
+def _employee_booking_stats(bookings_list):
+    """One pass over an employee's bookings: (stats dict, bookings still out, set of overdue booking ids).
+
+    Overdue means still out and booked more than 7 days ago.
+    """
+    # Only the still-out rows need their booking date read, so pick them out first
+    out_bookings = [b for b in bookings_list if b.get('t_return_date') == NOT_RETURNED]
+    # YYYY-MM-DD strings sort chronologically, so compare them directly instead of parsing each row
+    # (the same rule as the bookings-management overdue filter)
+    overdue_cutoff = (date.today() - timedelta(days=7)).isoformat()
+    overdue_ids = set()
+    for booking in out_bookings:
+        booking_date_str = booking.get('t_booking_date')
+        if isinstance(booking_date_str, str) and len(booking_date_str) == 10 and booking_date_str < overdue_cutoff:
+            overdue_ids.add(booking.get('t_booking_id'))
+    stats = {
+        'total_bookings': len(bookings_list),
+        'current_out': len(out_bookings),
+        'returned': len(bookings_list) - len(out_bookings),
+        'overdue_count': len(overdue_ids)
+    }
+    return stats, out_bookings, overdue_ids
+
 @app.route("/employee/dashboard")
 @employee_required
 def employee_dashboard():
@@ -2115,38 +2484,14 @@ def employee_dashboard():
             return redirect(url_for('login'))
         
         # Get only this employee's bookings
-        resp = _get("inventory_booking/get_date_data", params={"empid": employee_id})
-        
-        if isinstance(resp, dict) and resp.get("error"):
-            # Fallback to mock data
-            resp = mock_get("inventory_booking/get_date_data", {"empid": employee_id})
-        
-        bookings_list = resp.get("items", [])
+        bookings_list = _get_items("inventory_booking/get_date_data", {"empid": employee_id})
         
         # Calculate statistics for this employee only
-        total_bookings = len(bookings_list)
-        current_out = len([b for b in bookings_list if b.get('t_return_date') == 'Not Returned'])
-        overdue_count = 0
-        
-        # Check for overdue items (booking date + 7 days < today)
-        from datetime import date, timedelta
-        today = date.today()
-        for booking in bookings_list:
-            if booking.get('t_return_date') == 'Not Returned':
-                try:
-                    booking_date = datetime.strptime(booking.get('t_booking_date', ''), '%Y-%m-%d').date()
-                    if booking_date + timedelta(days=7) < today:
-                        overdue_count += 1
-                except:
-                    pass
+        stats, _, _ = _employee_booking_stats(bookings_list)
         
         return render_template("employee_dashboard.html", 
                              bookings=bookings_list,
-                             stats={
-                                 'total_bookings': total_bookings,
-                                 'current_out': current_out,
-                                 'overdue_count': overdue_count
-                             },
+                             stats=stats,
                              employee_id=employee_id,
                              MOCK_MODE=MOCK)
     except Exception as e:
@@ -2163,16 +2508,11 @@ def employee_inventory():
     """View available inventory (read-only for employees)."""
     try:
         # Get all inventory items
-        resp = _get("inventory/get")
-        
-        if isinstance(resp, dict) and resp.get("error"):
-            # Fallback to mock data
-            resp = mock_get("inventory/get", None)
-        
-        inventory_list = resp.get("items", [])
+        inventory_list = _get_items("inventory/get")
         
-        # Filter to show only available items (quantity > 0)
-        available_items = [item for item in inventory_list if item.get('t_item_quantity', 0) > 0]
+        # Filter to show only available items (quantity > 0). Kept as a list: the template tests
+        # `{% if inventory %}`, which a generator would always pass. A null quantity counts as 0
+        available_items = [item for item in inventory_list if (item.get('t_item_quantity') or 0) > 0]
         
         return render_template("employee_inventory.html", 
                              inventory=available_items,
@@ -2204,8 +2544,8 @@ def employee_request_equipment():
         
         # Validate dates
         try:
-            start_dt = datetime.strptime(start_date, '%Y-%m-%d')
-            end_dt = datetime.strptime(end_date, '%Y-%m-%d')
+            start_dt = _parse_iso_date(start_date)
+            end_dt = _parse_iso_date(end_date)
             if end_dt < start_dt:
                 return jsonify({"error": "End date must be after start date"}), 400
         except ValueError:
@@ -2216,7 +2556,7 @@ def employee_request_equipment():
             't_employee_id': employee_id,
             't_inventory_id': int(inventory_id),
             't_booking_date': start_date,
-            't_return_date': 'Not Returned',
+            't_return_date': NOT_RETURNED,
             'purpose': purpose,
             'status': 'requested'
         }
@@ -2240,23 +2580,33 @@ def employee_bookings():
             flash("Employee ID not found. Please contact administrator.", "danger")
             return redirect(url_for('employee_dashboard'))
         
-        # Get only this employee's bookings
-        resp = _get("inventory_booking/get_date_data", params={"empid": employee_id})
-        
-        if isinstance(resp, dict) and resp.get("error"):
-            # Fallback to mock data
-            resp = mock_get("inventory_booking/get_date_data", {"empid": employee_id})
+        # Get only this employee's bookings. The full list is fetched (and shared through the GET cache
+        # with the dashboard and the return check); only the requested page of rows is rendered
+        bookings_list = _get_items("inventory_booking/get_date_data", {"empid": employee_id})
+        stats, out_bookings, overdue_ids = _employee_booking_stats(bookings_list)
         
-        bookings_list = resp.get("items", [])
+        last_page = max(1, -(-len(bookings_list) // EMPLOYEE_BOOKINGS_PAGE_SIZE))
+        page = min(max(request.args.get('page', 1, type=int), 1), last_page)
+        start = (page - 1) * EMPLOYEE_BOOKINGS_PAGE_SIZE
         
         return render_template("employee_bookings.html", 
-                             bookings=bookings_list,
+                             bookings=bookings_list[start:start + EMPLOYEE_BOOKINGS_PAGE_SIZE],
+                             out_bookings=out_bookings,
+                             stats=stats,
+                             overdue_ids=overdue_ids,
+                             page=page,
+                             last_page=last_page,
                              employee_id=employee_id,
                              MOCK_MODE=MOCK)
     except Exception as e:
         flash(f"Error loading bookings: {str(e)}", "danger")
         return render_template("employee_bookings.html", 
                              bookings=[], 
+                             out_bookings=[],
+                             stats={'total_bookings': 0, 'current_out': 0, 'returned': 0, 'overdue_count': 0},
+                             overdue_ids=set(),
+                             page=1,
+                             last_page=1,
                              employee_id=current_user.get_employee_id(),
                              MOCK_MODE=MOCK)
 
@@ -2269,26 +2619,26 @@ def employee_return_equipment(booking_id):
         if not employee_id:
             return jsonify({"error": "Employee ID not found"}), 400
         
-        # Verify the booking belongs to this employee
+        # Verify the booking belongs to this employee. Same params as the employee's bookings pages,
+        # so this is usually answered from the GET cache
         resp = _get("inventory_booking/get_date_data", params={"empid": employee_id})
         
         if isinstance(resp, dict) and resp.get("error"):
             resp = mock_get("inventory_booking/get_date_data", {"empid": employee_id})
         
-        bookings_list = resp.get("items", [])
-        booking = next((b for b in bookings_list if b.get('t_booking_id') == booking_id), None)
+        booking = _find_row(resp, "t_booking_id", booking_id)
         
         if not booking:
             return jsonify({"error": "Booking not found or not owned by you"}), 404
         
-        if booking.get('t_return_date') != 'Not Returned':
+        if booking.get('t_return_date') != NOT_RETURNED:
             return jsonify({"error": "Equipment already returned"}), 400
         
         # Mark as returned
         return_data = {
             'bookid': booking_id,
             'empid': employee_id,
-            'returndate': date.today().strftime('%Y-%m-%d')
+            'returndate': _today_iso()
         }
         
         # Call the return API
@@ -2297,6 +2647,11 @@ def employee_return_equipment(booking_id):
         if isinstance(result, dict) and result.get("error"):
             return jsonify({"error": result["error"]}), 500
         
+        # The ownership check may have read a cached row; APEX has the final say on whether anything changed
+        # (same rule as booking_return: 0 rows without a 'no_change' status means it was already returned)
+        if isinstance(result, dict) and result.get("updated_rows") == 0 and result.get("status") != "no_change":
+            return jsonify({"error": "Equipment already returned"}), 400
+        
         flash("Equipment returned successfully!", "success")
         return jsonify({"status": "success", "message": "Equipment returned"})
         
@@ -2305,52 +2660,44 @@ def employee_return_equipment(booking_id):
 
 # ===== QR CODE GENERATION ROUTES =====
 
+def _employee_login_qr_payload(employee_id, employee):
+    """JSON content of an employee's login QR code."""
+    qr_data = {
+        "type": "employee_login",
+        "employee_id": str(employee_id),
+        "username": employee.get('t_emp_fname', ''),
+        # Day-granular, so the payload (and the cached PNG) stays the same for the whole day
+        "timestamp": _today_iso()
+    }
+    return orjson.dumps(qr_data).decode()
+
 @app.route("/generate-qr/employee/<int:employee_id>")
 @login_required
 def generate_employee_qr(employee_id):
     """Generate QR code for employee login."""
     try:
         # Verify the employee exists
-        resp = _get("employees/get", params={"empid": employee_id})
-        
-        if isinstance(resp, dict) and resp.get("error"):
-            resp = mock_get("employees/get", {"empid": employee_id})
-        
-        employees = resp.get("items", [])
-        employee = next((emp for emp in employees if emp.get('t_empid') == employee_id), None)
+        employee = _employee_by_id(employee_id)
         
         if not employee:
             return jsonify({"error": "Employee not found"}), 404
         
-        # Create QR code data
-        qr_data = {
-            "type": "employee_login",
-            "employee_id": str(employee_id),
-            "username": employee.get('t_emp_fname', ''),
-            "timestamp": datetime.now().isoformat()
-        }
-        
-        # Generate QR code
-        qr = qrcode.QRCode(version=1, box_size=10, border=5)
-        qr.add_data(json.dumps(qr_data))
-        qr.make(fit=True)
-        
-        # Create image
-        img = qr.make_image(fill_color="black", back_color="white")
+        # Generate QR code image (PNG bytes)
+        png = render_qr_png(_employee_login_qr_payload(employee_id, employee), error="m", border=5)
         
-        # Convert to bytes
-        buffer = io.BytesIO()
-        img.save(buffer, format='PNG')
-        buffer.seek(0)
-        
-        # Return image response
-        return app.response_class(
-            buffer.getvalue(),
+        # Return image response; the browser keeps it for an hour and then revalidates by ETag
+        response = send_file(
+            io.BytesIO(png),
             mimetype='image/png',
-            headers={
-                'Content-Disposition': f'inline; filename=employee-{employee_id}-qr-code.png'
-            }
+            download_name=f'employee-{employee_id}-qr-code.png',
+            max_age=3600,
+            etag=hashlib.blake2b(png, digest_size=8).hexdigest(),
+            conditional=True
         )
+        # The code names the employee, so keep it out of shared caches
+        response.cache_control.public = False
+        response.cache_control.private = True
+        return response
         
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -2364,26 +2711,13 @@ def generate_admin_qr():
         qr_data = {
             "type": "admin_login",
             "username": "admin",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": _today_iso()
         }
         
-        # Generate QR code
-        qr = qrcode.QRCode(version=1, box_size=10, border=5)
-        qr.add_data(json.dumps(qr_data))
-        qr.make(fit=True)
-        
-        # Create image
-        img = qr.make_image(fill_color="black", back_color="white")
-        
-        # Convert to base64
-        buffer = io.BytesIO()
-        img.save(buffer, format='PNG')
-        buffer.seek(0)
-        img_str = base64.b64encode(buffer.getvalue()).decode()
-        
+        # Generate QR code as a base64 data URI
         return jsonify({
             "status": "success",
-            "qr_code": f"data:image/png;base64,{img_str}",
+            "qr_code": render_qr_data_uri(orjson.dumps(qr_data).decode(), error="m", border=5),
             "admin": {
                 "username": "admin"
             }
@@ -2401,20 +2735,7 @@ def employee_qr_code():
         employee_id = current_user.employee_id
         
         # Get employee details
-        resp = _get("employees/get")
-        
-        if isinstance(resp, dict) and resp.get("error"):
-            resp = mock_get("employees/get", None)
-        
-        employees = resp.get("items", [])
-        current_employee = None
-        
-        # Find current employee in the list
-        for emp in employees:
-            if (emp.get("t_empid") == employee_id or 
-                emp.get("empid") == employee_id):
-                current_employee = emp
-                break
+        current_employee = _employee_by_id(employee_id)
         
         if not current_employee:
             flash("Employee information not found", "danger")
@@ -2434,21 +2755,44 @@ def qr_codes_page():
     """Page to display QR codes for login."""
     try:
         # Get all employees
-        resp = _get("employees/get")
-        
-        if isinstance(resp, dict) and resp.get("error"):
-            resp = mock_get("employees/get", None)
-        
-        employees = resp.get("items", [])
+        employees = _get_items("employees/get")
+        
+        def render():
+            # Embed every employee's code as a data URI, so the page needs no per-employee image requests;
+            # the images come from the QR render cache after the first view of the day
+            qr_codes = {
+                emp.get('t_empid'): render_qr_data_uri(_employee_login_qr_payload(emp.get('t_empid'), emp), error="m", border=5)
+                for emp in employees
+            }
+            return render_template("qr_codes.html", 
+                                 employees=employees,
+                                 qr_codes=qr_codes,
+                                 MOCK_MODE=MOCK)
         
-        return render_template("qr_codes.html", 
-                             employees=employees,
-                             MOCK_MODE=MOCK)
+        # The codes only change with the roster or the date
+        return conditional_response([employees, _today_iso()], render)
     except Exception as e:
         flash(f"Error loading QR codes page: {str(e)}", "danger")
         return render_template("qr_codes.html", 
                              employees=[], 
+                             qr_codes={},
                              MOCK_MODE=MOCK)
 
+# Endpoints every page needs, refetched shortly before their cache entries expire
+_WARM_ENDPOINTS = ("employees/get", "inventory/get")
+
+def _keep_apex_cache_warm():
+    """Background loop: refetch _WARM_ENDPOINTS so requests never pay for a cold APEX fetch."""
+    interval = max(APEX_CACHE_TTL - 5, 1)
+    while True:
+        for endpoint in _WARM_ENDPOINTS:
+            _get(endpoint, refresh=True)
+        time.sleep(interval)
+
 if __name__ == "__main__":
+    # Started here rather than at import so tests and WSGI workers never poll ORDS; under the
+    # debug reloader only the serving child (WERKZEUG_RUN_MAIN) runs it
+    if (APEX_CACHE_WARMUP and not MOCK and APEX_CACHE_TTL > 0
+            and (not FLASK_DEBUG or os.environ.get("WERKZEUG_RUN_MAIN") == "true")):
+        threading.Thread(target=_keep_apex_cache_warm, name="apex-cache-warmup", daemon=True).start()
     app.run(debug=FLASK_DEBUG, port=5000)
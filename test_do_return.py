@@ -1,106 +1,165 @@
 #!/usr/bin/env python3
 """
 Test script for the /do_return endpoint
-Run this after starting the Flask app to test the new endpoint
+Run this after starting the Flask app to test the new endpoint (python test_do_return.py, or pytest)
+All cases go out in one POST to /do_return_batch, which runs each through the /do_return logic;
+the route itself is also hit directly with a JSON body and with a form post
 """
 
+import orjson
+import pytest
 import requests
-import json
+import sys
+from dataclasses import dataclass
 from datetime import date
+from requests.adapters import HTTPAdapter
 
 # Flask app URL
 BASE_URL = "http://127.0.0.1:5000"
+# /do_return requires a logged-in user
+LOGIN = {"username": "admin", "password": "password123"}
+JSON_HEADERS = {"Content-Type": "application/json"}
+TODAY = date.today().isoformat()
 
-def test_do_return():
-    """Test the /do_return endpoint with various scenarios."""
-    
-    print("Testing /do_return endpoint...")
-    print("=" * 50)
-    
-    # Test data
-    test_cases = [
+@dataclass(frozen=True)
+class ReturnCase:
+    """One /do_return scenario and the status it should produce."""
+    name: str
+    data: dict
+    expected_status: int
+
+# Test data, built once along with TODAY
+TEST_CASES = (
+    ReturnCase(
+        "Valid return request",
         {
-            "name": "Valid return request",
-            "data": {
-                "empid": 1,
-                "bookid": 123,
-                "returndate": date.today().isoformat()
-            },
-            "expected_status": 200
+            "empid": 1,
+            "bookid": 123,
+            "returndate": TODAY
         },
+        200
+    ),
+    ReturnCase(
+        "Missing empid",
         {
-            "name": "Missing empid",
-            "data": {
-                "bookid": 123,
-                "returndate": date.today().isoformat()
-            },
-            "expected_status": 400
+            "bookid": 123,
+            "returndate": TODAY
         },
+        400
+    ),
+    ReturnCase(
+        "Non-numeric empid",
         {
-            "name": "Non-numeric empid",
-            "data": {
-                "empid": "abc",
-                "bookid": 123,
-                "returndate": date.today().isoformat()
-            },
-            "expected_status": 400
+            "empid": "abc",
+            "bookid": 123,
+            "returndate": TODAY
         },
+        400
+    ),
+    ReturnCase(
+        "Invalid date format",
         {
-            "name": "Invalid date format",
-            "data": {
-                "empid": 1,
-                "bookid": 123,
-                "returndate": "2025-13-45"  # Invalid date
-            },
-            "expected_status": 400
+            "empid": 1,
+            "bookid": 123,
+            "returndate": "2025-13-45"  # Invalid date
         },
+        400
+    ),
+    ReturnCase(
+        "Mock: Already returned (bookid=999)",
         {
-            "name": "Mock: Already returned (bookid=999)",
-            "data": {
-                "empid": 1,
-                "bookid": 999,
-                "returndate": date.today().isoformat()
-            },
-            "expected_status": 200
+            "empid": 1,
+            "bookid": 999,
+            "returndate": TODAY
         },
+        200
+    ),
+    ReturnCase(
+        "Mock: Error scenario (bookid=888)",
         {
-            "name": "Mock: Error scenario (bookid=888)",
-            "data": {
-                "empid": 1,
-                "bookid": 888,
-                "returndate": date.today().isoformat()
-            },
-            "expected_status": 500
-        }
-    ]
-    
-    for test_case in test_cases:
-        print(f"\nTest: {test_case['name']}")
-        print(f"Data: {test_case['data']}")
+            "empid": 1,
+            "bookid": 888,
+            "returndate": TODAY
+        },
+        500
+    )
+)
+# The batch body is serialized once up front and sent as-is
+BATCH_BODY = orjson.dumps([test_case.data for test_case in TEST_CASES])
+
+def verify_ok(result):
+    """200: the return was recorded or reported as already done, with no error."""
+    return result['status'] == 200 and "error" not in result['body']
+
+def verify_bad_request(result):
+    """400: rejected by validation with an error message."""
+    return result['status'] == 400 and bool(result['body'].get("error"))
+
+def verify_server_error(result):
+    """500: the APEX failure surfaced as an error message."""
+    return result['status'] == 500 and bool(result['body'].get("error"))
+
+# Verifier for each expected status, so every case's check is picked by lookup
+VERIFIERS = {
+    200: verify_ok,
+    400: verify_bad_request,
+    500: verify_server_error,
+}
+
+@pytest.fixture(scope="session")
+def session():
+    """Logged-in session shared by every case; skips the cases if the app is not running."""
+    # One session for the battery keeps the login cookie on the same keep-alive connection
+    with requests.Session() as session:
+        # Requests go out one at a time to a single host, so one pooled socket is enough;
+        # no retries, so a failed request is reported rather than silently resent
+        session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=1, max_retries=0))
         
+        # Logging in doubles as the warm-up and the connectivity check; a short connect
+        # timeout means a stopped app is reported at once
         try:
-            response = requests.post(
-                f"{BASE_URL}/do_return",
-                json=test_case['data'],
-                headers={'Content-Type': 'application/json'},
-                timeout=5
-            )
-            
-            print(f"Status Code: {response.status_code}")
-            print(f"Response: {response.json()}")
-            
-            if response.status_code == test_case['expected_status']:
-                print("✅ PASS")
-            else:
-                print(f"❌ FAIL - Expected {test_case['expected_status']}, got {response.status_code}")
-                
+            response = session.post(f"{BASE_URL}/login", data=LOGIN, timeout=(1, 5), allow_redirects=False)
         except requests.exceptions.ConnectionError:
-            print("❌ FAIL - Could not connect to Flask app. Make sure it's running on http://127.0.0.1:5000")
-        except Exception as e:
-            print(f"❌ FAIL - Error: {e}")
-    
-    print("\n" + "=" * 50)
-    print("Test completed!")
+            pytest.skip(f"Could not connect to Flask app. Make sure it's running on {BASE_URL}")
+        # A successful login redirects away from /login; otherwise every case would just get the login page
+        assert response.status_code == 302 and "/login" not in response.headers.get("Location", ""), \
+            f"Login as {LOGIN['username']} failed: status {response.status_code}"
+        yield session
+
+@pytest.fixture(scope="session")
+def batch_results(session):
+    """[{status, body}, ...] for TEST_CASES, from a single /do_return_batch request."""
+    # The server handles the cases one after another, so allow each its usual 5 s
+    response = session.post(
+        f"{BASE_URL}/do_return_batch",
+        data=BATCH_BODY,
+        headers=JSON_HEADERS,
+        timeout=5 * len(TEST_CASES)
+    )
+    return orjson.loads(response.content)
+
+@pytest.mark.parametrize("index, case", list(enumerate(TEST_CASES)), ids=[case.name for case in TEST_CASES])
+def test_do_return(batch_results, index, case):
+    """Each /do_return scenario answers with its expected status."""
+    result = batch_results[index]
+    assert VERIFIERS[case.expected_status](result), f"Status Code: {result['status']}, Response: {result['body']}"
+
+@pytest.mark.parametrize("encoding", ["json", "form"])
+def test_do_return_direct(session, encoding):
+    """/do_return itself reads the valid case from a JSON body or from form fields."""
+    case = TEST_CASES[0]
+    body = {"json": case.data} if encoding == "json" else {"data": case.data}
+    response = session.post(f"{BASE_URL}/do_return", timeout=5, **body)
+    result = {"status": response.status_code, "body": orjson.loads(response.content)}
+    assert VERIFIERS[case.expected_status](result), f"Status Code: {result['status']}, Response: {result['body']}"
+
+def test_do_return_batch_too_large(session):
+    """/do_return_batch rejects arrays over its limit before processing any entry."""
+    # Invalid entries, so nothing is recorded even if the limit were not enforced
+    body = orjson.dumps([TEST_CASES[1].data] * 51)
+    response = session.post(f"{BASE_URL}/do_return_batch", data=body, headers=JSON_HEADERS, timeout=5)
+    result = {"status": response.status_code, "body": orjson.loads(response.content)}
+    assert verify_bad_request(result), f"Status Code: {result['status']}, Response: {result['body']}"
 
 if __name__ == "__main__":
-    test_do_return()
+    sys.exit(pytest.main([__file__, "-v"]))